@@ -15,6 +15,15 @@ arXiv 论文阅读器包
 __version__ = "1.0.0"
 __author__ = "paper_reader"
 
-# 方便导入
-from config import CONFIG
-from database import db_manager
+
+def __getattr__(name):
+    """方便导入：按需加载 CONFIG / db_manager，导入包本身没有副作用"""
+    if name == "CONFIG":
+        from config import CONFIG
+
+        return CONFIG
+    if name == "db_manager":
+        from database import db_manager
+
+        return db_manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -24,12 +24,17 @@ ssl._create_default_https_context = lambda: ssl_context
 # 导入路由和后台服务
 from routes import app
 from stats_service import start_background_services, start_main_server
+from translators import init_dictionary
 
 
 if __name__ == "__main__":
     # 检查是否禁用后台下载
     enable_background_fetch = "--fetch" in sys.argv
 
+    # 启动阶段：定位并校验词典，缺失时直接退出
+    if not init_dictionary():
+        sys.exit(1)
+
     # 启动后台服务
     start_background_services(enable_fetch=enable_background_fetch)
 
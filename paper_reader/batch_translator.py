@@ -8,18 +8,26 @@
 
 import re
 import sqlite3
+import sys
 import threading
 import time
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 from pathlib import Path
 
 import translate
+from config import CONFIG
+from translation_cache import PersistentTranslationCache, ShardedLRUCache
 
 
-@dataclass
-class TranslationResult:
-    """翻译结果数据类"""
+class TranslationResult(NamedTuple):
+    """
+    翻译结果（不可变元组）
+
+    没有实例 __dict__，缓存中保存的就是 is_cached=True 的版本，
+    命中时直接返回同一个对象，无需复制。
+    """
     word: str
     translation: str
     phonetic: str = ""
@@ -27,17 +35,97 @@ class TranslationResult:
     is_cached: bool = False
     query_time_ms: float = 0.0
 
+    def as_cached(self) -> "TranslationResult":
+        """存入缓存的版本：is_cached=True、耗时为 0"""
+        if self.is_cached and not self.query_time_ms:
+            return self
+        # 直接按位置构造，比 _replace 快（预加载时每个单词都要调用一次）
+        return TranslationResult(self[0], self[1], self[2], self[3], True, 0.0)
+
+
+# PDF 文本中不可见、但会把单词切开的字符：软连字符、零宽空格/连接符、BOM
+_INVISIBLE_CHARS = re.compile('[\u00ad\u200b\u200c\u200d\u2060\ufeff]')
+
+# 行尾断词："classi-\nfication"；PDF.js 按文本项拼接时换行变成空格，即 "classi- fication"
+_HYPHENATED = re.compile(r'\b([A-Za-z]+)[-\u2010\u2011]\s+([A-Za-z]+)')
+
+# 文本块末尾可能被截断的部分：未写完的单词（含连字、软连字符），或断词 "classi- fica"
+_LETTER = r'(?:[^\W\d_]|[\u00ad\u200b\u200c\u200d\u2060\ufeff])'
+_CHUNK_TAIL = re.compile(r'(?:%s+[-\u2010\u2011]\s*)?%s*$' % (_LETTER, _LETTER))
+
+# 词首以外含大写字母的单词（BERT、ResNet、GPUs）：多为缩写或专名，查不到时不做拼写纠错
+_CASED_WORD = re.compile(r'(?<![A-Za-z])[A-Za-z][a-z]*[A-Z][A-Za-z]*')
+
+# 整段文本按此大小切块送入流式分词
+TEXT_CHUNK_SIZE = 256 * 1024
+
+
+class _Flight:
+    """
+    一次正在进行的词典查询（一个认领块），其他线程等待同一次查询的结果
+
+    块内所有单词共用一个 flight，整块只需创建和唤醒一个 Event。
+    """
+    __slots__ = ("event", "results", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.results: Dict[str, TranslationResult] = {}
+        self.error: Optional[BaseException] = None
+
+
+# 缓存条目的固定开销：6 个字段的元组 + 4 个字符串对象头（按非 ASCII 字符串计）
+_RESULT_OVERHEAD = sys.getsizeof(TranslationResult("", "")) + sys.getsizeof("") + 3 * sys.getsizeof("释")
+
+
+def _result_size(word: str, result: TranslationResult) -> int:
+    """
+    估算一个缓存条目占用的字节数
+
+    按字符数估算：释义和音标含非 ASCII 字符，每字符按 2 字节计。
+    每个缓存写入都要调用一次，不逐个调用 sys.getsizeof。
+    """
+    return (_RESULT_OVERHEAD + len(word)
+            + 2 * (len(result[1]) + len(result[2]) + len(result[3])))
+
 
 class BatchTranslator:
     """批量翻译器 - 预加载和缓存论文中的单词翻译"""
     
-    def __init__(self, db_path: str = "ecdict.db"):
+    def __init__(self, db_path: str = "ecdict.db",
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None,
+                 persist_path: Optional[str] = None):
+        """
+        Args:
+            db_path: 词典数据库路径
+            max_entries: 内存缓存最大条目数，默认取 CONFIG
+            max_bytes: 内存缓存近似内存上限，默认取 CONFIG
+            persist_path: 磁盘缓存路径，为 None 时不启用磁盘缓存
+        """
         self.dict_path = db_path
-        self._cache: Dict[str, TranslationResult] = {}
-        self._lock = threading.RLock()
+        # 分片缓存自带锁，读写缓存不再经过全局锁
+        self._cache = ShardedLRUCache(
+            max_entries=CONFIG["TRANSLATION_CACHE_MAX_ENTRIES"] if max_entries is None else max_entries,
+            max_bytes=CONFIG["TRANSLATION_CACHE_MAX_BYTES"] if max_bytes is None else max_bytes,
+            sizeof=_result_size,
+            shards=CONFIG["TRANSLATION_CACHE_SHARDS"],
+        )
+        self._store: Optional[PersistentTranslationCache] = None
+        if persist_path:
+            try:
+                self._store = PersistentTranslationCache(persist_path, db_path)
+            except sqlite3.Error as e:
+                print(f"⚠ 磁盘翻译缓存不可用: {e}")
+        # 只保护 _inflight 的认领与发布，缓存命中路径不经过此锁
+        self._lock = threading.Lock()
+        # 单词 -> 正在进行的查询；同一单词的并发未命中只查一次词典
+        self._inflight: Dict[str, _Flight] = {}
         self._translator: Optional[translate.ECDict] = None
         self._common_words: Set[str] = set()
         self._load_common_words()
+        # 启动预热进度，由 get_cache_stats 返回
+        self._warmup: Dict = {"state": "idle", "done": 0, "total": 0}
         
     def _get_translator(self) -> translate.ECDict:
         """延迟初始化翻译器"""
@@ -45,6 +133,12 @@ class BatchTranslator:
             self._translator = translate.ECDict(db_file=self.dict_path)
         return self._translator
     
+    def open_dictionary(self) -> None:
+        """打开词典：补建缺失的索引并建立第一个只读连接（启动阶段调用）"""
+        translator = self._get_translator()
+        translator.migrate()
+        translator.search("the")
+
     def _load_common_words(self):
         """加载常见停用词（不需要翻译的词）"""
         # 常见停用词和短词
@@ -70,6 +164,121 @@ class BatchTranslator:
             'vols', 'ed', 'eds', 'pp', 'par', 'pars', 'chap', 'chaps'
         }
     
+    def normalize_text(self, text: str) -> str:
+        """
+        分词前修复 PDF 提取造成的断词
+
+        1. NFKC 规范化：连字（ﬁ、ﬂ、ﬀ、ﬃ…）展开为普通字母，全角字母转半角
+        2. 删除软连字符和零宽字符
+        3. 行尾断词 "classi-\nfication" 仅在拼接后的单词能在词典中查到
+           （词条或已知变形）时合并，"pre- and post-" 之类保持原样
+
+        Args:
+            text: PDF 文本
+
+        Returns:
+            修复后的文本
+        """
+        text = _INVISIBLE_CHARS.sub('', unicodedata.normalize('NFKC', text))
+
+        joined = {(a + b).lower() for a, b in _HYPHENATED.findall(text)}
+        if not joined:
+            return text
+        try:
+            translator = self._get_translator()
+            candidates = list(joined)
+            known = set(translator.search_many(candidates))
+            known.update(translator.lemmatize_many([w for w in candidates if w not in known]))
+        except Exception as e:
+            print(f"⚠ 断词修复时查询词典失败: {e}")
+            return text
+
+        def rejoin(match):
+            head, tail = match.group(1), match.group(2)
+            return head + tail if (head + tail).lower() in known else match.group(0)
+
+        return _HYPHENATED.sub(rejoin, text)
+
+    def tokenize_stream(self, chunks: Iterable[str],
+                        min_length: int = 3) -> Iterator[Tuple[str, int, bool]]:
+        """
+        流式分词：逐块读取文本，产出 (单词, 出现次数, 是否以大写形式出现过)
+
+        chunks 是同一段文本按顺序切出的片段（按页传入时每页末尾应带换行），
+        块尾未写完的单词和断词前半截会留到下一块拼接后再处理。
+        内存占用只与词汇量和单块大小有关，与全文长度无关。
+
+        Args:
+            chunks: 文本块（或逐页文本）的可迭代对象
+            min_length: 最小单词长度
+
+        Yields:
+            按字母序排列的 (小写单词, 次数, 是否为缩写/专名)，已过滤停用词
+        """
+        pattern = re.compile(r'[a-zA-Z]{%d,}' % min_length)
+        counts: Counter = Counter()
+        cased: Set[str] = set()
+        for _, text in self._iter_normalized(chunks):
+            cased.update(_CASED_WORD.findall(text))
+            # 单块内的 findall 列表随块释放，计数在 C 层完成
+            counts.update(pattern.findall(text.lower()))
+
+        for word in self._common_words:
+            counts.pop(word, None)
+        cased = {word.lower() for word in cased}
+        for word, count in sorted(counts.items()):
+            yield word, count, word in cased
+
+    def tokenize_pages(self, pages: Iterable[str],
+                       min_length: int = 3) -> Iterator[Tuple[str, int, int, bool]]:
+        """
+        按页流式分词，额外记录每个单词首次出现的页码
+
+        跨页断词按完整单词计入后一页。
+
+        Args:
+            pages: 逐页文本
+            min_length: 最小单词长度
+
+        Yields:
+            按字母序排列的 (小写单词, 次数, 首次出现页码, 是否为缩写/专名)，页码从 1 开始
+        """
+        pattern = re.compile(r'[a-zA-Z]{%d,}' % min_length)
+        counts: Counter = Counter()
+        cased: Set[str] = set()
+        first_page: Dict[str, int] = {}
+        for index, text in self._iter_normalized(page + '\n' for page in pages):
+            cased.update(_CASED_WORD.findall(text))
+            page_counts = Counter(pattern.findall(text.lower()))
+            counts.update(page_counts)
+            for word in page_counts:
+                first_page.setdefault(word, index + 1)
+
+        for word in self._common_words:
+            counts.pop(word, None)
+        cased = {word.lower() for word in cased}
+        for word, count in sorted(counts.items()):
+            yield word, count, first_page[word], word in cased
+
+    def _iter_normalized(self, chunks: Iterable[str]) -> Iterator[Tuple[int, str]]:
+        """
+        逐块产出 (块序号, 修复后的文本)，保留大小写供调用方识别缩写
+
+        块尾未写完的单词和断词前半截留到下一块，与下一块一起产出。
+        """
+        carry = ''
+        index = -1
+        for index, chunk in enumerate(chunks):
+            if not chunk:
+                continue
+            text = carry + chunk
+            # 只在块尾附近查找，避免对整块回溯
+            cut = _CHUNK_TAIL.search(text, max(0, len(text) - 256)).start()
+            carry = text[cut:]
+            yield index, self.normalize_text(text[:cut])
+        if carry:
+            yield max(index, 0), self.normalize_text(carry)
+
     def extract_words_from_text(self, text: str, min_length: int = 3) -> List[str]:
         """
         从文本中提取英文单词
@@ -81,27 +290,220 @@ class BatchTranslator:
         Returns:
             去重后的单词列表
         """
-        # 提取英文单词
-        words = re.findall(r'[a-zA-Z]{%d,}' % min_length, text)
-        
-        # 转换为小写并去重
-        unique_words = set()
-        for word in words:
-            word = word.lower().strip()
-            # 过滤停用词和纯数字
-            if word and word not in self._common_words and not word.isdigit():
-                unique_words.add(word)
-        
-        return sorted(list(unique_words))
+        return [word for word, _, _ in self.tokenize_stream(iter_text_chunks(text), min_length)]
     
+    # 预加载只需要这几列，不读取 detail、exchange 等大字段
+    _RESULT_COLUMNS = ['word', 'phonetic', 'translation', 'definition']
+
+    @staticmethod
+    def _build_result(word: str, dict_result: Optional[Dict],
+                      query_time: float) -> TranslationResult:
+        """把词典查询结果格式化为 TranslationResult"""
+        if not dict_result:
+            return TranslationResult(
+                word=word,
+                translation=f"[未找到] {word}",
+                is_cached=False,
+                query_time_ms=query_time
+            )
+
+        phonetic = dict_result.get('phonetic', '')
+        translation = dict_result.get('translation', '')
+        definition = dict_result.get('definition', '')
+
+        # 格式化翻译结果
+        if translation:
+            formatted = f"音标：/{phonetic}/。释义：{translation}"
+        elif definition:
+            formatted = f"释义：{definition}"
+        else:
+            formatted = "暂无翻译"
+
+        # 按位置构造（预加载时每个单词都要构造一次，关键字参数更慢）
+        return TranslationResult(word, formatted, phonetic, translation or definition,
+                                 False, query_time)
+
+    def _load_from_store(self, words: List[str]) -> Dict[str, TranslationResult]:
+        """从磁盘缓存读取并回填内存缓存"""
+        if self._store is None or not words:
+            return {}
+        try:
+            if self._store.check_signature():
+                self._dictionary_changed()
+            rows = self._store.get_many(words)
+        except sqlite3.Error as e:
+            print(f"⚠ 读取磁盘翻译缓存失败: {e}")
+            return {}
+
+        loaded = {
+            key: TranslationResult(
+                word=word,
+                translation=translation,
+                phonetic=phonetic,
+                meaning=meaning,
+                is_cached=True,
+                query_time_ms=0
+            )
+            for key, (word, translation, phonetic, meaning) in rows.items()
+        }
+        self._cache.update(loaded)
+        return loaded
+
+    def _dictionary_changed(self) -> None:
+        """词典被重新构建：丢弃内存缓存中的旧翻译，只读连接重新打开新文件"""
+        self._cache.clear()
+        if self._translator is not None:
+            self._translator.close()
+
+    def _save_to_store(self, results: Dict[str, TranslationResult]) -> None:
+        """把新查到的结果写入磁盘缓存（错误结果不落盘）"""
+        if self._store is None:
+            return
+        items = {
+            key: (r.word, r.translation, r.phonetic, r.meaning)
+            for key, r in results.items()
+            if not r.translation.startswith("[翻译错误]")
+        }
+        try:
+            self._store.put_many(items)
+        except sqlite3.Error as e:
+            print(f"⚠ 写入磁盘翻译缓存失败: {e}")
+
+    def _lookup_words(self, translator: translate.ECDict, words: List[str],
+                      start_time: float) -> Dict[str, TranslationResult]:
+        """
+        查询词典并写入缓存
+
+        词典中没有的单词按 exchange 变形索引还原为原形后再查，
+        变形词与原形共享同一个 TranslationResult（word 字段为原形），
+        原形已在缓存中时直接复用，不再查词典。
+
+        Returns:
+            words 中每个单词的翻译结果
+        """
+        dict_results = translator.search_many(words, columns=self._RESULT_COLUMNS)
+        misses = [w for w in words if w not in dict_results]
+        lemma_of = translator.lemmatize_many(misses) if misses else {}
+
+        # 原形的翻译结果：优先复用缓存，其余一次批量查询
+        lemma_results: Dict[str, TranslationResult] = {}
+        if lemma_of:
+            lemmas = list(set(lemma_of.values()))
+            for lemma in lemmas:
+                cached = self._cache.get(lemma.lower())
+                if cached is not None:
+                    lemma_results[lemma] = cached
+            pending = [lemma for lemma in lemmas if lemma not in lemma_results]
+            if pending:
+                lemma_rows = translator.search_many(pending, columns=self._RESULT_COLUMNS)
+                query_time = (time.time() - start_time) * 1000 / len(words)
+                for lemma in pending:
+                    if lemma in lemma_rows:
+                        lemma_results[lemma] = self._build_result(
+                            lemma.lower(), lemma_rows[lemma], query_time
+                        )
+
+        # 批量查询无法区分单词耗时，按平均值记录
+        query_time = (time.time() - start_time) * 1000 / len(words)
+        # 存入缓存的是 is_cached=True 的版本；原形也单独缓存，之后同一原形的其他变形直接命中，
+        # 变形与原形共用同一个缓存对象
+        lemma_views = {lemma: r.as_cached() for lemma, r in lemma_results.items()}
+        results = {}
+        to_cache = {}
+        build = self._build_result
+        for word in words:
+            row = dict_results.get(word)
+            if row is not None:
+                r = build(word, row, query_time)
+                results[word] = r
+                to_cache[word] = TranslationResult(r[0], r[1], r[2], r[3], True, 0.0)
+            elif lemma_of.get(word) in lemma_results:
+                results[word] = lemma_results[lemma_of[word]]
+                to_cache[word] = lemma_views[lemma_of[word]]
+            else:
+                r = build(word, None, query_time)
+                results[word] = r
+                to_cache[word] = TranslationResult(r[0], r[1], r[2], r[3], True, 0.0)
+
+        to_cache.update((r.word, r) for r in lemma_views.values())
+        self._cache.update(to_cache)
+        self._save_to_store(to_cache)
+        return results
+
+    def _resolve(self, translator: translate.ECDict, words: List[str],
+                 start_time: float) -> Dict[str, TranslationResult]:
+        """
+        查询未缓存的单词，与其他线程正在进行的同词查询合并（single-flight）
+
+        本线程认领没有其他线程在查的单词并查询词典，其余单词等待对方的结果。
+        查询期间不持有 self._lock，认领只针对本次传入的单词，
+        因此大批量预加载不会让单词翻译排在整篇论文之后。
+
+        Returns:
+            words 中每个单词的翻译结果
+        """
+        results: Dict[str, TranslationResult] = {}
+        own: List[str] = []
+        own_flight = _Flight()
+        waiting: Dict[str, _Flight] = {}
+        # 查询方先写缓存再发布 flight，因此在锁内先查缓存、再查 _inflight 不会漏掉结果
+        with self._lock:
+            # 认领前再查一次缓存：可能刚被其他请求查到（按分片批量读取，每个分片只加一次锁）
+            results.update(self._cache.get_many(words))
+            for word in words:
+                if word in results:
+                    continue
+                flight = self._inflight.get(word)
+                if flight is None:
+                    self._inflight[word] = own_flight
+                    own.append(word)
+                else:
+                    waiting[word] = flight
+
+        error: Optional[BaseException] = None
+        try:
+            if own:
+                results.update(self._lookup_words(translator, own, start_time))
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # 无论成功与否都要唤醒等待者，避免其永久阻塞
+            if own:
+                own_flight.results = {word: results[word] for word in own if word in results}
+                own_flight.error = error
+                with self._lock:
+                    for word in own:
+                        del self._inflight[word]
+                own_flight.event.set()
+
+        for word, flight in waiting.items():
+            flight.event.wait()
+            result = flight.results.get(word)
+            if result is not None:
+                results[word] = result.as_cached()
+            else:
+                results[word] = TranslationResult(
+                    word=word,
+                    translation=f"[翻译错误] {flight.error}",
+                    is_cached=False,
+                    query_time_ms=0
+                )
+        return results
+
     def batch_translate(self, words: List[str], 
-                        progress_callback=None) -> Dict[str, TranslationResult]:
+                        progress_callback=None,
+                        chunk_size: int = 500,
+                        correct: Iterable[str] = ()) -> Dict[str, TranslationResult]:
         """
         批量翻译单词
         
         Args:
             words: 单词列表
             progress_callback: 进度回调函数 (current, total)
+            chunk_size: 每次批量查询词典的单词数
+            correct: 查不到时尝试拼写纠错的单词（论文预加载传入，应排除缩写和专名），
+                纠正结果带"已纠正为 X"标记，只出现在返回值中，不写入缓存
             
         Returns:
             单词到翻译结果的映射
@@ -110,72 +512,87 @@ class BatchTranslator:
         total = len(words)
         
         # 首先检查缓存
-        uncached_words = []
-        with self._lock:
-            for word in words:
-                if word in self._cache:
-                    results[word] = self._cache[word]
-                else:
-                    uncached_words.append(word)
+        results.update(self._cache.get_many(words))
+        uncached_words = [w for w in words if w not in results]
+        
+        # 其次检查磁盘缓存
+        if uncached_words and self._store is not None:
+            stored = self._load_from_store(uncached_words)
+            results.update(stored)
+            uncached_words = [w for w in uncached_words if w not in stored]
         
-        # 批量查询未缓存的单词
+        # 分块批量查询未缓存的单词，每块只需一次词典往返
         if uncached_words:
             translator = self._get_translator()
             
-            for i, word in enumerate(uncached_words):
+            for i in range(0, len(uncached_words), chunk_size):
+                chunk = uncached_words[i:i + chunk_size]
                 start_time = time.time()
                 
                 try:
-                    dict_result = translator.search(word)
-                    query_time = (time.time() - start_time) * 1000
-                    
-                    if dict_result:
-                        phonetic = dict_result.get('phonetic', '')
-                        translation = dict_result.get('translation', '')
-                        definition = dict_result.get('definition', '')
-                        
-                        # 格式化翻译结果
-                        if translation:
-                            formatted = f"音标：/{phonetic}/。释义：{translation}"
-                        elif definition:
-                            formatted = f"释义：{definition}"
-                        else:
-                            formatted = "暂无翻译"
-                        
-                        result = TranslationResult(
-                            word=word,
-                            translation=formatted,
-                            phonetic=phonetic,
-                            meaning=translation or definition,
-                            is_cached=False,
-                            query_time_ms=query_time
-                        )
-                    else:
-                        result = TranslationResult(
+                    chunk_results = self._resolve(translator, chunk, start_time)
+                except Exception as e:
+                    chunk_results = {
+                        word: TranslationResult(
                             word=word,
-                            translation=f"[未找到] {word}",
+                            translation=f"[翻译错误] {str(e)}",
                             is_cached=False,
-                            query_time_ms=query_time
+                            query_time_ms=0
                         )
-                except Exception as e:
-                    result = TranslationResult(
-                        word=word,
-                        translation=f"[翻译错误] {str(e)}",
-                        is_cached=False,
-                        query_time_ms=0
+                        for word in chunk
+                    }
+                    self._cache.update(
+                        {word: r.as_cached() for word, r in chunk_results.items()}
                     )
                 
-                results[word] = result
-                
-                # 存入缓存
-                with self._lock:
-                    self._cache[word] = result
+                results.update(chunk_results)
                 
                 # 进度回调
                 if progress_callback:
                     progress_callback(len(results), total)
         
+        if correct:
+            results.update(self._correct_spelling(results, correct))
         return results
+
+    def _correct_spelling(self, results: Dict[str, TranslationResult],
+                          correct: Iterable[str]) -> Dict[str, TranslationResult]:
+        """
+        对查不到的单词做拼写纠错（PDF 提取出错导致的未命中）
+
+        缓存中仍保存该单词的 [未找到] 结果：纠正只是猜测，
+        单词翻译接口和磁盘缓存不应把另一个单词的释义当作本词的释义。
+
+        Returns:
+            纠正成功的单词到带标记结果的映射
+        """
+        misses = [w for w in correct
+                  if w in results and results[w].translation.startswith("[未找到]")]
+        if not misses:
+            return {}
+        try:
+            suggestions = self._get_translator().suggest_many(misses)
+        except sqlite3.Error as e:
+            print(f"⚠ 拼写纠错失败: {e}")
+            return {}
+        if not suggestions:
+            return {}
+
+        targets = self.batch_translate(list({s.lower() for s in suggestions.values()}))
+        corrected = {}
+        for word, suggestion in suggestions.items():
+            target = targets.get(suggestion.lower())
+            if target is None or target.translation.startswith(("[未找到]", "[翻译错误]")):
+                continue
+            corrected[word] = TranslationResult(
+                word=word,
+                translation=f"已纠正为 {suggestion}。{target.translation}",
+                phonetic=target.phonetic,
+                meaning=target.meaning,
+                is_cached=False,
+                query_time_ms=0
+            )
+        return corrected
     
     def translate(self, word: str) -> TranslationResult:
         """
@@ -189,60 +606,21 @@ class BatchTranslator:
         """
         word = word.lower().strip()
         
-        # 检查缓存
-        with self._lock:
-            if word in self._cache:
-                cached = self._cache[word]
-                return TranslationResult(
-                    word=cached.word,
-                    translation=cached.translation,
-                    phonetic=cached.phonetic,
-                    meaning=cached.meaning,
-                    is_cached=True,
-                    query_time_ms=0
-                )
+        # 检查缓存（缓存中保存的就是 is_cached=True 的结果，直接返回）
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+        
+        stored = self._load_from_store([word])
+        if word in stored:
+            return stored[word]
         
         # 缓存未命中，查询词典
         start_time = time.time()
         
         try:
             translator = self._get_translator()
-            dict_result = translator.search(word)
-            query_time = (time.time() - start_time) * 1000
-            
-            if dict_result:
-                phonetic = dict_result.get('phonetic', '')
-                translation = dict_result.get('translation', '')
-                definition = dict_result.get('definition', '')
-                
-                if translation:
-                    formatted = f"音标：/{phonetic}/。释义：{translation}"
-                elif definition:
-                    formatted = f"释义：{definition}"
-                else:
-                    formatted = "暂无翻译"
-                
-                result = TranslationResult(
-                    word=word,
-                    translation=formatted,
-                    phonetic=phonetic,
-                    meaning=translation or definition,
-                    is_cached=False,
-                    query_time_ms=query_time
-                )
-            else:
-                result = TranslationResult(
-                    word=word,
-                    translation=f"[未找到] {word}",
-                    is_cached=False,
-                    query_time_ms=query_time
-                )
-            
-            # 存入缓存
-            with self._lock:
-                self._cache[word] = result
-            
-            return result
+            return self._resolve(translator, [word], start_time)[word]
             
         except Exception as e:
             return TranslationResult(
@@ -252,36 +630,107 @@ class BatchTranslator:
                 query_time_ms=0
             )
     
+    def warm_up(self, words: Iterable[str] = (), top_words: int = 0,
+                exclude: Iterable[str] = (), chunk_size: int = 1000,
+                progress_callback=None) -> Dict:
+        """
+        预热内存缓存
+
+        先加载 words（如用户历史上查询最多的单词），再按词频加载 top_words 个常用词。
+        总数不超过内存缓存条目上限的 90%（分片不均时单个分片会先满），
+        避免预热过程淘汰自己刚加载的条目；
+        停用词、exclude 中的单词和已缓存的单词不再查询。
+
+        Args:
+            words: 优先预热的单词
+            top_words: 额外预热的高频词数量
+            exclude: 不需要预热的单词（如熟词）
+            chunk_size: 每批翻译的单词数，每批结束后报告一次进度
+            progress_callback: 进度回调 (done, total)
+
+        Returns:
+            {"words": 预热单词数, "loaded": 新查询的单词数, "seconds": 耗时}
+        """
+        start_time = time.time()
+        skip = set(exclude) | self._common_words
+        budget = self._cache.max_entries * 9 // 10 or None
+        plan: List[str] = []
+        seen: Set[str] = set()
+
+        def add(candidates: Iterable[str]) -> None:
+            for word in candidates:
+                word = word.lower().strip()
+                if budget is not None and len(plan) >= budget:
+                    return
+                if len(word) < 3 or word in skip or word in seen:
+                    continue
+                seen.add(word)
+                plan.append(word)
+
+        self._warmup = {"state": "running", "done": 0, "total": 0}
+        try:
+            add(words)
+            if top_words > 0 and (budget is None or len(plan) < budget):
+                add(self._get_translator().top_words(top_words))
+            pending = [w for w in plan if w not in self._cache]
+            self._warmup["total"] = len(plan)
+            self._warmup["done"] = len(plan) - len(pending)
+
+            for i in range(0, len(pending), chunk_size):
+                self.batch_translate(pending[i:i + chunk_size], chunk_size=chunk_size)
+                self._warmup["done"] += len(pending[i:i + chunk_size])
+                if progress_callback:
+                    progress_callback(self._warmup["done"], len(plan))
+        except Exception:
+            self._warmup["state"] = "failed"
+            raise
+
+        seconds = time.time() - start_time
+        self._warmup.update(state="done", seconds=round(seconds, 2))
+        return {"words": len(plan), "loaded": len(pending), "seconds": seconds}
+
     def get_cache_stats(self) -> Dict:
         """获取缓存统计信息"""
-        with self._lock:
-            return {
-                'cache_size': len(self._cache),
-                'cached_words': list(self._cache.keys())[:100]  # 最多返回100个
-            }
+        stats = self._cache.stats()
+        stats['cached_words'] = self._cache.keys(limit=100)  # 最多返回100个
+        stats['warmup'] = dict(self._warmup)
+        if self._store is not None:
+            stats['persistent'] = self._store.stats()
+        return stats
     
     def clear_cache(self):
         """清空缓存"""
-        with self._lock:
-            self._cache.clear()
+        self._cache.clear()
+        if self._store is not None:
+            self._store.clear()
     
-    def preload_paper_words(self, text_content: str, 
+    def preload_paper_words(self, text_content: Union[str, Iterable[str]],
                            progress_callback=None) -> Dict[str, TranslationResult]:
         """
         预加载论文中的所有单词
         
         Args:
-            text_content: PDF文本内容
+            text_content: PDF文本内容，或逐页文本的可迭代对象
             progress_callback: 进度回调
             
         Returns:
             翻译结果字典
         """
-        # 提取单词
-        words = self.extract_words_from_text(text_content)
+        # 流式提取单词
+        chunks = iter_text_chunks(text_content) if isinstance(text_content, str) else text_content
+        entries = list(self.tokenize_stream(chunks))
+        words = [word for word, _, _ in entries]
         
-        # 批量翻译
-        return self.batch_translate(words, progress_callback)
+        # 批量翻译：缩写和专名不做拼写纠错
+        return self.batch_translate(
+            words, progress_callback, correct=[word for word, _, cased in entries if not cased]
+        )
+
+
+def iter_text_chunks(text: str, chunk_size: int = TEXT_CHUNK_SIZE) -> Iterator[str]:
+    """把整段文本切成 chunk_size 大小的块，供 tokenize_stream 使用"""
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
 
 
 # 全局批量翻译器实例
@@ -295,7 +744,9 @@ def get_batch_translator(db_path: str = "ecdict.db") -> BatchTranslator:
     
     with _translator_lock:
         if _batch_translator is None:
-            _batch_translator = BatchTranslator(db_path)
+            _batch_translator = BatchTranslator(
+                db_path, persist_path=CONFIG.get("TRANSLATION_CACHE_DB_PATH")
+            )
         return _batch_translator
 
 
@@ -0,0 +1,673 @@
+"""
+性能基准测试脚本
+
+用法（在 paper_reader 目录下运行）：
+    python benchmarks.py preload [--db ecdict.db] [--words 10000]
+    python benchmarks.py concurrency [--duration 2]
+    python benchmarks.py compiled [--lookups 20000]
+    python benchmarks.py build [--csv ecdict.csv]
+    python benchmarks.py normalize [--text-dir papers/] [--papers 20]
+    python benchmarks.py memory [--entries 100000]
+    python benchmarks.py hits [--duration 1]
+    python benchmarks.py importtime [--budget-ms 300]
+    python benchmarks.py logging [--duration 2]
+    python benchmarks.py wordqueries [--rows 1000000]
+
+未指定 --db 时会在临时目录生成一个合成词典，便于在没有 ECDICT 的环境下对比。
+"""
+
+import argparse
+import csv
+import glob
+import os
+import random
+import re
+import string
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, List, Optional
+
+import translate
+from batch_translator import BatchTranslator, TranslationResult
+from database import DatabaseManager
+from translation_cache import LRUCache
+
+
+def make_synthetic_csv(directory: str, size: int = 100000) -> str:
+    """生成合成的 ECDICT CSV，返回 CSV 路径"""
+    rng = random.Random(42)
+    csv_path = os.path.join(directory, "ecdict.csv")
+
+    seen = set()
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["word", "phonetic", "definition", "translation", "pos",
+                         "collins", "oxford", "tag", "bnc", "frq", "exchange",
+                         "detail", "audio"])
+        while len(seen) < size:
+            word = "".join(rng.choice(string.ascii_lowercase)
+                           for _ in range(rng.randint(3, 12)))
+            if word in seen:
+                continue
+            seen.add(word)
+            rank = rng.randint(1, 60000) if rng.random() < 0.3 else 0
+            writer.writerow([word, "", f"n. {word}", f"n. 释义{len(seen) % 997}", "",
+                             0, 0, "", rank, rank, "", "", ""])
+    return csv_path
+
+
+def make_synthetic_dictionary(directory: str, size: int = 100000) -> str:
+    """生成合成的 ECDICT 词典（CSV + SQLite），返回数据库路径"""
+    csv_path = make_synthetic_csv(directory, size)
+    db_path = os.path.join(directory, "ecdict.db")
+    translate.ECDict(csv_file=csv_path, db_file=db_path).build_db()
+    return db_path
+
+
+def sample_paper_words(tool: translate.ECDict, count: int,
+                       miss_ratio: float = 0.05) -> List[str]:
+    """从词典中抽取 count 个不同单词模拟一篇论文的词表，混入少量未登录词"""
+    rng = random.Random(7)
+    with tool._connection() as conn:
+        rows = conn.execute(
+            "SELECT word FROM words WHERE word NOT LIKE '% %' ORDER BY RANDOM() LIMIT ?",
+            (count,),
+        ).fetchall()
+    words = [row["word"].lower() for row in rows]
+
+    misses = int(len(words) * miss_ratio)
+    for i in range(misses):
+        words[i] = "zq" + "".join(rng.choice(string.ascii_lowercase) for _ in range(8))
+    return words
+
+
+def bench_preload(db_path: str, word_count: int) -> None:
+    """对比逐词查询与批量查询的预加载耗时"""
+    tool = translate.ECDict(db_file=db_path)
+    words = sample_paper_words(tool, word_count)
+    print(f"论文词表: {len(words)} 个不同单词")
+
+    # 之前：每个未缓存单词一次 ECDict.search
+    tool.search(words[0])
+    start = time.perf_counter()
+    for word in words:
+        BatchTranslator._build_result(word, tool.search(word), 0.0)
+    before = time.perf_counter() - start
+
+    # 之后：BatchTranslator.batch_translate 走 ECDict.search_many
+    bt = BatchTranslator(db_path)
+    bt._translator = tool
+    start = time.perf_counter()
+    bt.batch_translate(words)
+    after = time.perf_counter() - start
+
+    print(f"逐词 search:        {before * 1000:8.1f} ms")
+    print(f"batch_translate:    {after * 1000:8.1f} ms")
+    print(f"加速比:             {before / after:8.2f}x")
+
+
+def bench_compiled(db_path: str, lookups: int) -> None:
+    """单词查询延迟：SQLite vs 编译后的 mmap 词典"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_tool = translate.ECDict(db_file=db_path,
+                                       compiled_file=os.path.join(tmp, "missing.bin"))
+        words = sample_paper_words(sqlite_tool, lookups, miss_ratio=0.0)
+        compiled_tool = translate.ECDict(db_file=db_path,
+                                         compiled_file=os.path.join(tmp, "ecdict.bin"))
+        compiled_tool.compile()
+
+        for name, tool in (("SQLite", sqlite_tool), ("mmap 编译词典", compiled_tool)):
+            tool.search(words[0])
+            start = time.perf_counter()
+            for word in words:
+                tool.search(word)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<12} {elapsed * 1e6 / len(words):8.2f} us/次")
+        compiled_tool.close()
+
+
+def _legacy_build(csv_path: str, db_path: str, batch_size: int = 5000) -> int:
+    """旧版导入流程：先建索引、默认日志模式、每 batch_size 行提交一次"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE words (word TEXT PRIMARY KEY, phonetic TEXT, definition TEXT, "
+        "translation TEXT, pos TEXT, collins INTEGER, oxford INTEGER, tag TEXT, "
+        "bnc INTEGER, frq INTEGER, exchange TEXT, detail TEXT, audio TEXT)"
+    )
+    conn.execute("CREATE INDEX idx_word ON words(word)")
+    conn.execute("CREATE INDEX idx_word_nocase ON words(word COLLATE NOCASE)")
+    conn.execute("CREATE INDEX idx_trans ON words(translation)")
+    insert_sql = "INSERT OR REPLACE INTO words VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    count = 0
+    with open(csv_path, "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        batch = []
+        for row in reader:
+            if len(row) < 4:
+                continue
+            batch.append(row[:13] + [""] * (13 - len(row)))
+            count += 1
+            if len(batch) >= batch_size:
+                conn.executemany(insert_sql, batch)
+                conn.commit()
+                batch = []
+        if batch:
+            conn.executemany(insert_sql, batch)
+            conn.commit()
+    conn.close()
+    return count
+
+
+def bench_build(csv_path: str) -> None:
+    """词典导入速度：旧版导入流程 vs build_db"""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.db")
+        start = time.perf_counter()
+        rows = _legacy_build(csv_path, legacy_db)
+        before = time.perf_counter() - start
+
+        tool = translate.ECDict(csv_file=csv_path, db_file=os.path.join(tmp, "ecdict.db"))
+        stats = tool.build_db()
+        tool.close()
+
+        print(f"{'':<14} {'导入行数':>10} {'耗时(s)':>10} {'行/秒':>10}")
+        print(f"{'旧版导入':<14} {rows:>10} {before:>10.2f} {rows / before:>10.0f}")
+        print(f"{'build_db 导入':<14} {stats['rows']:>10} {'':>10} {stats['rows_per_sec']:>10}")
+        print(f"{'build_db 全部':<14} {stats['rows']:>10} {stats['seconds']:>10.2f} "
+              f"{stats['rows'] / max(stats['seconds'], 1e-9):>10.0f}  （含前缀/词形索引）")
+
+
+_LIGATURES = (("ffi", "\ufb03"), ("ffl", "\ufb04"), ("ff", "\ufb00"),
+               ("fi", "\ufb01"), ("fl", "\ufb02"))
+
+
+def make_synthetic_paper(words: List[str], rng: random.Random, line_width: int = 80) -> str:
+    """
+    用词表拼出一篇“PDF 提取文本”：按行宽折行，行尾长词断词加连字符，
+    fi/fl/ff 替换为连字，少量单词插入软连字符；行间以空格拼接（与 PDF.js 一致）
+    """
+    lines, line = [], ""
+    for word in words:
+        for plain, ligature in _LIGATURES:
+            word = word.replace(plain, ligature)
+        if len(word) > 6 and rng.random() < 0.02:
+            cut = rng.randint(2, len(word) - 2)
+            word = word[:cut] + "\u00ad" + word[cut:]
+        if len(line) + len(word) + 1 > line_width:
+            room = line_width - len(line) - 2
+            if len(word) >= 6 and room >= 3:
+                cut = min(room, len(word) - 3)
+                lines.append(f"{line} {word[:cut]}-")
+                line = word[cut:]
+                continue
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    lines.append(line)
+    return " ".join(lines)
+
+
+def bench_normalize(db_path: str, text_dir: str, papers: int) -> None:
+    """每篇论文因断词/连字修复减少的不同单词查询数"""
+    bt = BatchTranslator(db_path)
+    if text_dir:
+        corpus = []
+        for path in sorted(glob.glob(os.path.join(text_dir, "*.txt")))[:papers]:
+            with open(path, encoding="utf-8") as f:
+                corpus.append((os.path.basename(path), f.read()))
+    else:
+        tool = bt._get_translator()
+        vocabulary = sample_paper_words(tool, 3000, miss_ratio=0.0)
+        rng = random.Random(11)
+        corpus = [
+            (f"synthetic-{i}", make_synthetic_paper(
+                [rng.choice(vocabulary) for _ in range(6000)], rng))
+            for i in range(papers)
+        ]
+
+    def raw_words(text: str) -> set:
+        # 修复前的分词方式
+        return {w.lower() for w in re.findall(r"[a-zA-Z]{3,}", text)} - bt._common_words
+
+    total_before = total_after = 0
+    print(f"{'论文':<24} {'修复前':>8} {'修复后':>8} {'减少':>8}")
+    for name, text in corpus:
+        before = len(raw_words(text))
+        after = len(bt.extract_words_from_text(text))
+        total_before += before
+        total_after += after
+        print(f"{name[:24]:<24} {before:>8} {after:>8} {before - after:>8}")
+    if corpus:
+        print(f"平均每篇减少 {(total_before - total_after) / len(corpus):.1f} 次不同单词查询"
+              f"（{(total_before - total_after) / max(total_before, 1):.1%}）")
+
+
+@dataclass
+class _LegacyTranslationResult:
+    """旧版 TranslationResult（普通 dataclass，带实例 __dict__）"""
+    word: str
+    translation: str
+    phonetic: str = ""
+    meaning: str = ""
+    is_cached: bool = False
+    query_time_ms: float = 0.0
+
+
+def bench_memory(entries: int) -> None:
+    """缓存 entries 个单词的内存占用，以及缓存命中时的分配开销"""
+    rng = random.Random(3)
+    rows = []
+    for i in range(entries):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12))) + str(i)
+        meaning = f"n. 释义{i % 997}, 含义{i % 131}"
+        rows.append((word, f"音标：/{word}/。释义：{meaning}", word, meaning))
+
+    print(f"{'':<22} {'缓存内存(MB)':>12} {'每条(B)':>9} {'命中耗时(ns)':>13}")
+    for name, cls, hit in (
+        ("dataclass + 命中复制", _LegacyTranslationResult,
+         lambda r: _LegacyTranslationResult(r.word, r.translation, r.phonetic, r.meaning, True, 0)),
+        ("NamedTuple 缓存视图", TranslationResult, lambda r: r),
+    ):
+        tracemalloc.start()
+        cache = LRUCache()
+        for word, translation, phonetic, meaning in rows:
+            cache.put(word, cls(word, translation, phonetic, meaning, True, 0.0))
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        keys = [row[0] for row in rows]
+        start = time.perf_counter()
+        for key in keys:
+            hit(cache.get(key))
+        elapsed = time.perf_counter() - start
+
+        print(f"{name:<22} {used / 1024 / 1024:>12.1f} {used / entries:>9.0f} "
+              f"{elapsed * 1e9 / entries:>13.0f}")
+
+
+def _run_clients(lookup: Callable[[str], object], words: List[str],
+                 clients: int, duration: float) -> float:
+    """clients 个线程在 duration 秒内循环查词，返回每秒查询数"""
+    counts = [0] * clients
+    deadline = time.perf_counter() + duration
+
+    def worker(idx: int):
+        rng = random.Random(idx)
+        n = 0
+        while time.perf_counter() < deadline:
+            lookup(rng.choice(words))
+            n += 1
+        counts[idx] = n
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(counts) / duration
+
+
+def bench_concurrency(db_path: str, duration: float) -> None:
+    """并发查词吞吐：共享单连接 vs 只读连接池"""
+    tool = translate.ECDict(db_file=db_path)
+    words = sample_paper_words(tool, 5000, miss_ratio=0.0)
+
+    # 之前：所有线程共用一个连接（SQLite 在连接内部串行化）
+    shared = sqlite3.connect(db_path, check_same_thread=False)
+    shared.row_factory = sqlite3.Row
+    shared_lock = threading.Lock()
+
+    def shared_search(word: str):
+        # 与 ECDict.search 执行同一条 SQL，只比较连接的使用方式
+        with shared_lock:
+            row = shared.execute(translate.ECDict.SEARCH_SQL, (word, word)).fetchone()
+        return dict(row) if row else None
+
+    print(f"{'并发数':>6} {'单连接 QPS':>12} {'连接池 QPS':>12}")
+    for clients in (1, 4, 16):
+        before = _run_clients(shared_search, words, clients, duration)
+        after = _run_clients(tool.search, words, clients, duration)
+        print(f"{clients:>6} {before:>12.0f} {after:>12.0f}")
+    shared.close()
+    tool.close()
+
+
+class _GlobalLockCache:
+    """旧版缓存：一个 LRUCache 外加一把全局 RLock，所有读写串行"""
+
+    def __init__(self):
+        self._cache = LRUCache()
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._cache.get(key, default)
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._cache.get(key)
+                if value is not None:
+                    found[key] = value
+        return found
+
+    def update(self, items):
+        with self._lock:
+            self._cache.update(items)
+
+
+def bench_hits(db_path: str, duration: float) -> None:
+    """缓存命中吞吐：全局锁 vs 分片锁，1~32 个线程同时调用 translate"""
+    tool = translate.ECDict(db_file=db_path)
+    words = sample_paper_words(tool, 5000, miss_ratio=0.0)
+    tool.close()
+
+    legacy = BatchTranslator(db_path)
+    legacy._cache = _GlobalLockCache()
+    sharded = BatchTranslator(db_path)
+    for translator in (legacy, sharded):
+        translator.batch_translate(words)
+
+    print(f"{'线程数':>6} {'全局锁 QPS':>12} {'分片锁 QPS':>12}")
+    for clients in (1, 2, 4, 8, 16, 32):
+        before = _run_clients(legacy.translate, words, clients, duration)
+        after = _run_clients(sharded.translate, words, clients, duration)
+        print(f"{clients:>6} {before:>12.0f} {after:>12.0f}")
+
+
+class _LegacyDatabaseManager(DatabaseManager):
+    """旧版连接管理：每次调用新建连接、用完关闭，回滚日志模式"""
+
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def release_connection(self, conn):
+        conn.close()
+
+
+def bench_logging(db_path: str, duration: float) -> None:
+    """查词 + 记录查询的吞吐：每次新建连接 vs 连接池 + WAL vs 写入队列"""
+    tool = translate.ECDict(db_file=db_path)
+    words = sample_paper_words(tool, 2000, miss_ratio=0.0)
+    tool.close()
+    translator = BatchTranslator(db_path)
+    translator.batch_translate(words)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = _LegacyDatabaseManager(os.path.join(tmp, "legacy.db"))
+        pooled = DatabaseManager(os.path.join(tmp, "pooled.db"))
+        queued = DatabaseManager(os.path.join(tmp, "queued.db"))
+
+        def make_lookup(record: Callable):
+            def lookup(word: str):
+                result = translator.translate(word)
+                record(word, translation=result.translation,
+                       paper_id="2401.00001", session_id="bench")
+            return lookup
+
+        print(f"{'并发数':>6} {'新建连接 QPS':>14} {'连接池+WAL QPS':>16} {'写入队列 QPS':>14}")
+        for clients in (1, 4, 8):
+            qps = [
+                _run_clients(make_lookup(record), words, clients, duration)
+                for record in (legacy.record_word_query, pooled.record_word_query,
+                               queued.enqueue_word_query)
+            ]
+            queued.flush_word_queries(timeout=60)
+            print(f"{clients:>6} {qps[0]:>14.0f} {qps[1]:>16.0f} {qps[2]:>14.0f}")
+        pooled.close()
+        queued.close()
+
+
+# (名称, 旧版 SQL, 使用 query_date 的 SQL, 参数名)；参数名对应今天、会话或单词
+_WORD_QUERY_CASES = (
+    ("查今日记录",
+     "SELECT id, query_count FROM word_queries WHERE word = ? AND DATE(query_time) = ? AND session_id = ?",
+     "SELECT id, query_count FROM word_queries WHERE word = ? AND query_date = ? AND session_id = ?",
+     ("word", "today", "session")),
+    ("今日统计",
+     "SELECT COUNT(DISTINCT session_id), COUNT(*), COUNT(DISTINCT word), "
+     "SUM(CASE WHEN query_count > 1 THEN 1 ELSE 0 END) FROM word_queries WHERE DATE(query_time) = ?",
+     "SELECT COUNT(DISTINCT session_id), COUNT(*), COUNT(DISTINCT word), "
+     "SUM(CASE WHEN query_count > 1 THEN 1 ELSE 0 END) FROM word_queries WHERE query_date = ?",
+     ("today",)),
+    ("今日分类分布",
+     "SELECT category, COUNT(*) FROM word_queries "
+     "WHERE DATE(query_time) = ? AND category IS NOT NULL GROUP BY category",
+     "SELECT category, COUNT(*) FROM word_queries "
+     "WHERE query_date = ? AND category IS NOT NULL GROUP BY category",
+     ("today",)),
+    ("7 天词频",
+     "SELECT word, COUNT(*), SUM(query_count) AS total FROM word_queries "
+     "WHERE query_time >= DATE('now', '-7 days') GROUP BY word ORDER BY total DESC LIMIT 20",
+     "SELECT word, COUNT(*), SUM(query_count) AS total FROM word_queries "
+     "WHERE query_date >= DATE('now', 'localtime', '-7 days') GROUP BY +word ORDER BY total DESC LIMIT 20",
+     ()),
+    ("会话统计",
+     "SELECT COUNT(DISTINCT word), COUNT(*) FROM word_queries WHERE session_id = ?",
+     "SELECT COUNT(DISTINCT word), COUNT(*) FROM word_queries WHERE session_id = ?",
+     ("session",)),
+    ("分类统计",
+     "SELECT category, COUNT(DISTINCT paper_id), COUNT(*), COUNT(DISTINCT word) "
+     "FROM word_queries WHERE category IS NOT NULL GROUP BY category",
+     "SELECT category, COUNT(DISTINCT paper_id), COUNT(*), COUNT(DISTINCT word) "
+     "FROM word_queries WHERE category IS NOT NULL GROUP BY category",
+     ()),
+)
+
+
+def _time_query(conn: sqlite3.Connection, sql: str, args: tuple, repeat: int) -> float:
+    """执行 repeat 次，返回平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, args).fetchall()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_word_queries(rows: int, repeat: int = 5) -> None:
+    """word_queries 热点查询：DATE(query_time) 全表扫描 vs query_date + 覆盖索引"""
+    rng = random.Random(11)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+                  for _ in range(20000)]
+    categories = ["cs.AI", "cs.CL", "cs.LG", "math.NT", "math.AG", None]
+    today = date.today()
+    per_day = max(rows // 365, 1)
+
+    def generate():
+        for i in range(rows):
+            day = today - timedelta(days=i // per_day)
+            session = f"s{i // 200}"
+            word = vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)]
+            yield (word, f"{day} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00",
+                   rng.randint(1, 3), session, f"2401.{i // 200 % 5000:05d}", rng.choice(categories))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "reading_stats.db")
+        conn = sqlite3.connect(db_path)
+        # 旧版表结构：没有 query_date 列，也没有索引
+        conn.execute("""
+            CREATE TABLE word_queries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                word TEXT NOT NULL, context TEXT, translation TEXT,
+                paper_id TEXT, category TEXT,
+                query_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                query_count INTEGER DEFAULT 1, session_id TEXT,
+                last_query_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        start = time.perf_counter()
+        conn.executemany(
+            "INSERT INTO word_queries (word, query_time, query_count, session_id, paper_id, category)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            generate(),
+        )
+        conn.commit()
+        print(f"生成 {rows} 行: {time.perf_counter() - start:.1f} 秒")
+
+        args = {"today": today.isoformat(), "session": f"s{per_day // 400}",
+                "word": vocabulary[0]}
+        before = [
+            _time_query(conn, old_sql, tuple(args[k] for k in keys), repeat)
+            for _, old_sql, _, keys in _WORD_QUERY_CASES
+        ]
+        conn.close()
+
+        start = time.perf_counter()
+        db = DatabaseManager(db_path)
+        print(f"迁移（添加 query_date、回填、建索引）: {time.perf_counter() - start:.1f} 秒")
+
+        conn = db.get_connection()
+        after = [
+            _time_query(conn, new_sql, tuple(args[k] for k in keys), repeat)
+            for _, _, new_sql, keys in _WORD_QUERY_CASES
+        ]
+        db.release_connection(conn)
+        db.close()
+
+    print(f"{'查询':<14} {'旧版(ms)':>10} {'索引(ms)':>10} {'加速':>8}")
+    for (name, *_), old_ms, new_ms in zip(_WORD_QUERY_CASES, before, after):
+        print(f"{name:<14} {old_ms:>10.2f} {new_ms:>10.2f} {old_ms / max(new_ms, 1e-3):>7.0f}x")
+
+
+# 导入这些模块时不应加载的重依赖（按需导入）
+HEAVY_MODULES = ("arxiv", "requests", "urllib3", "pypdf", "feedparser")
+
+
+def _import_time_ms(module: str, cwd: str) -> Optional[float]:
+    """python -X importtime 测得的 module 累计导入耗时（毫秒）"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1])
+        return None
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    return None
+
+
+def bench_importtime(modules: List[str], budget_ms: float, runs: int = 3) -> bool:
+    """
+    导入耗时预算检查：每个模块取 runs 次中的最小值，
+    并确认导入后没有创建数据库管理器、没有加载重依赖
+
+    Returns:
+        全部模块是否都在预算内且无副作用
+    """
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    ok = True
+    print(f"{'模块':<16} {'导入耗时(ms)':>12} {'预算(ms)':>9}  副作用")
+    for module in modules:
+        times = [t for t in (_import_time_ms(module, cwd) for _ in range(runs)) if t is not None]
+        probe = subprocess.run(
+            [sys.executable, "-c",
+             f"import sys, database, {module}\n"
+             f"print(database.db_manager._instance is not None)\n"
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"],
+            cwd=cwd, capture_output=True, text=True,
+        )
+        if not times or probe.returncode != 0:
+            print(f"{module:<16} {'导入失败':>12}")
+            ok = False
+            continue
+        created_db, heavy = probe.stdout.splitlines()
+        effects = []
+        if created_db == "True":
+            effects.append("已创建 db_manager")
+        if heavy:
+            effects.append(f"已导入 {heavy}")
+        elapsed = min(times)
+        passed = elapsed <= budget_ms and not effects
+        ok = ok and passed
+        print(f"{module:<16} {elapsed:>12.1f} {budget_ms:>9.0f}  "
+              f"{'; '.join(effects) or '无'}{'' if passed else '  ✗'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="paper_reader 性能基准测试")
+    parser.add_argument("--db", help="ecdict.db 路径，缺省时生成合成词典")
+    parser.add_argument("--dict-size", type=int, default=100000, help="合成词典大小")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    preload = sub.add_parser("preload", help="论文预加载：逐词查询 vs 批量查询")
+    preload.add_argument("--words", type=int, default=10000, help="论文不同单词数")
+
+    concurrency = sub.add_parser("concurrency", help="并发查词吞吐：1/4/16 个客户端")
+    concurrency.add_argument("--duration", type=float, default=2.0, help="每轮持续秒数")
+
+    compiled = sub.add_parser("compiled", help="单词查询延迟：SQLite vs mmap 编译词典")
+    compiled.add_argument("--lookups", type=int, default=20000, help="查询次数")
+
+    build = sub.add_parser("build", help="词典导入速度：旧版导入流程 vs build_db")
+    build.add_argument("--csv", help="完整 ECDICT CSV 路径，缺省时生成合成 CSV")
+
+    normalize = sub.add_parser("normalize", help="断词/连字修复减少的不同单词查询数")
+    normalize.add_argument("--text-dir", help="论文文本目录（*.txt），缺省时生成合成论文")
+    normalize.add_argument("--papers", type=int, default=20, help="论文篇数")
+
+    memory = sub.add_parser("memory", help="缓存内存占用：dataclass vs NamedTuple")
+    memory.add_argument("--entries", type=int, default=100000, help="缓存单词数")
+
+    hits = sub.add_parser("hits", help="缓存命中吞吐：全局锁 vs 分片锁，1~32 个线程")
+    hits.add_argument("--duration", type=float, default=1.0, help="每轮持续秒数")
+
+    logging = sub.add_parser("logging", help="查词 + 记录查询吞吐：新建连接 vs 连接池 + WAL vs 写入队列")
+    logging.add_argument("--duration", type=float, default=2.0, help="每轮持续秒数")
+
+    wordqueries = sub.add_parser("wordqueries", help="word_queries 热点查询：DATE() 全表扫描 vs 索引")
+    wordqueries.add_argument("--rows", type=int, default=1000000, help="查询记录行数")
+
+    importtime = sub.add_parser("importtime", help="导入耗时预算检查（超出预算时退出码为 1）")
+    importtime.add_argument("--budget-ms", type=float, default=300.0, help="每个模块的导入耗时预算")
+    importtime.add_argument("--modules", default="routes,stats_service,translators,database",
+                            help="逗号分隔的模块名")
+
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        bench_memory(args.entries)
+        return
+    if args.command == "wordqueries":
+        bench_word_queries(args.rows)
+        return
+    if args.command == "importtime":
+        if not bench_importtime(args.modules.split(","), args.budget_ms):
+            sys.exit(1)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.command == "build":
+            bench_build(args.csv or make_synthetic_csv(tmp, args.dict_size))
+            return
+        db_path = args.db or make_synthetic_dictionary(tmp, args.dict_size)
+        if args.command == "preload":
+            bench_preload(db_path, args.words)
+        elif args.command == "concurrency":
+            bench_concurrency(db_path, args.duration)
+        elif args.command == "compiled":
+            bench_compiled(db_path, args.lookups)
+        elif args.command == "normalize":
+            bench_normalize(db_path, args.text_dir, args.papers)
+        elif args.command == "hits":
+            bench_hits(db_path, args.duration)
+        elif args.command == "logging":
+            bench_logging(db_path, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,20 @@ CONFIG = {
     "LOG_DIR": os.path.join(BASE_DIR, "log"),
     "TEMPLATE_DIR": os.path.join(BASE_DIR, "templates"),
     "STATIC_DIR": os.path.join(BASE_DIR, "static"),
+    # 翻译缓存容量上限（0 表示不限制）
+    "TRANSLATION_CACHE_MAX_ENTRIES": 50000,
+    "TRANSLATION_CACHE_MAX_BYTES": 64 * 1024 * 1024,
+    # 内存翻译缓存分片数（按单词哈希分片加锁，取 2 的幂）
+    "TRANSLATION_CACHE_SHARDS": 16,
+    # 启动时在后台预热翻译缓存：词频最高的单词 + 用户查询最多的单词，单词数为 0 表示跳过该来源
+    "CACHE_WARMUP_ENABLED": True,
+    "CACHE_WARMUP_TOP_WORDS": 20000,
+    "CACHE_WARMUP_USER_WORDS": 5000,
+    # 单词查询记录写入队列：队列上限（满时改为同步写入）和合并写入的间隔（秒）
+    "QUERY_LOG_QUEUE_SIZE": 10000,
+    "QUERY_LOG_FLUSH_INTERVAL": 0.5,
+    # 磁盘翻译缓存（与 reading_stats.db 同目录），设为 None 关闭
+    "TRANSLATION_CACHE_DB_PATH": os.path.join(BASE_DIR, "db", "translation_cache.db"),
 }
 
 # arXiv 获取器配置
@@ -23,5 +37,7 @@ FETCHER_CONFIG = {
     "pdf_dir": CONFIG["PDF_DIR"],
 }
 
-# 词典数据库路径
-DICT_DB_PATH = os.path.join(BASE_DIR, "ecdict.db")
+# 词典数据库路径：默认 paper_reader/ecdict.db，可用环境变量 DICT_DB_PATH 覆盖
+# （相对路径按启动时的工作目录解析为绝对路径）
+DICT_DB_PATH = os.path.abspath(os.path.expanduser(
+    os.environ.get("DICT_DB_PATH") or os.path.join(BASE_DIR, "ecdict.db")))
@@ -1,25 +1,106 @@
 """数据库管理模块 - 处理所有数据库操作"""
 
+import atexit
 import sqlite3
 import json
 import os
+import queue
+import threading
+import time
+from collections import Counter, namedtuple
 from datetime import datetime
 from config import CONFIG
 
+# 每个新连接执行的 PRAGMA：
+# WAL 模式下读写互不阻塞（统计页面读取不再等待查词记录写入），
+# synchronous=NORMAL 在 WAL 下只在检查点时 fsync，断电最多丢失最近的事务、不会损坏数据库
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# word_queries 的索引（名称, 列）：
+# - date: record_word_query 按 (日期, 会话, 单词) 查今日记录；每日统计与词频统计按日期过滤。
+#   包含这些查询用到的全部列（覆盖索引），无需回表
+# - word: word_history 按单词查询并按时间排序
+# - session: 结束会话时按会话统计不同单词数
+# - category: 分类统计按分类聚合论文数和单词数
+WORD_QUERY_INDEXES = (
+    ("idx_word_queries_date", "(query_date, session_id, word, query_count, category)"),
+    ("idx_word_queries_word", "(word, query_time)"),
+    ("idx_word_queries_session", "(session_id, word)"),
+    ("idx_word_queries_category", "(category, paper_id, word)"),
+)
+
+# 一次单词查询（写入队列的事件）；today 为查询发生时的本地日期
+WordQuery = namedtuple(
+    "WordQuery", "word context translation paper_id category session_id today"
+)
+
 
 class DatabaseManager:
     """数据库管理器"""
 
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, pool_size=8):
+        """
+        Args:
+            db_path: 数据库路径，默认取 CONFIG["DB_PATH"]
+            pool_size: 连接池保留的空闲连接数上限
+        """
         self.db_path = db_path or CONFIG["DB_PATH"]
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # 空闲连接池：连接在调用之间复用，每个调用独占借出的连接
+        self.pool_size = pool_size
+        self._idle = queue.LifoQueue()
+        # 熟词集合的内存副本及其对应的版本号
+        self._familiar_lock = threading.Lock()
+        self._familiar_set = None
+        self._familiar_set_version = None
+        # 查询记录写入队列（write-behind），写入线程在第一次入队时启动
+        self._query_queue = queue.Queue(maxsize=CONFIG["QUERY_LOG_QUEUE_SIZE"])
+        self._query_writer = None
+        self._query_writer_lock = threading.Lock()
         self.init_database()
 
-    def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+    def _open_connection(self):
+        """打开一个新连接并设置 PRAGMA"""
+        conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
+    def get_connection(self):
+        """从连接池借出一个连接，用完后调用 release_connection 归还"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._open_connection()
+
+    def release_connection(self, conn):
+        """归还连接：回滚未提交的事务后放回连接池，池满时关闭"""
+        try:
+            conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close(self):
+        """关闭连接池中的空闲连接"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
     def init_database(self):
         """初始化数据库表结构"""
         conn = self.get_connection()
@@ -62,6 +143,7 @@ class DatabaseManager:
                 query_count INTEGER DEFAULT 1,
                 session_id TEXT,
                 last_query_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                query_date TEXT,
                 FOREIGN KEY (paper_id) REFERENCES papers(arxiv_id)
             )
         """)
@@ -127,6 +209,30 @@ class DatabaseManager:
             )
         """)
 
+        # 论文词表（服务端从 PDF 提取）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS paper_vocabulary (
+                paper_id TEXT NOT NULL,
+                word TEXT NOT NULL,
+                count INTEGER DEFAULT 1,
+                first_page INTEGER,
+                cased INTEGER DEFAULT 0,
+                PRIMARY KEY (paper_id, word)
+            ) WITHOUT ROWID
+        """)
+
+        # 论文词表的提取记录，PDF 修改时间变化后重新提取
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS paper_vocabulary_meta (
+                paper_id TEXT PRIMARY KEY,
+                source_mtime REAL,
+                page_count INTEGER DEFAULT 0,
+                word_count INTEGER DEFAULT 0,
+                indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                bundle_etag TEXT
+            )
+        """)
+
         # 用户阅读偏好表
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS user_preferences (
@@ -137,7 +243,7 @@ class DatabaseManager:
         """)
 
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
 
         # 执行数据库迁移（添加新列）
         self.migrate_database()
@@ -203,8 +309,63 @@ class DatabaseManager:
             except Exception as e:
                 print(f"  ⚠ 添加列失败 pages_read: {e}")
 
+        # 检查并添加 paper_vocabulary_meta 表的新列
+        cursor.execute("PRAGMA table_info(paper_vocabulary_meta)")
+        columns = [col["name"] for col in cursor.fetchall()]
+
+        if "bundle_etag" not in columns:
+            try:
+                cursor.execute(
+                    "ALTER TABLE paper_vocabulary_meta ADD COLUMN bundle_etag TEXT"
+                )
+                print("  ✓ 添加列: paper_vocabulary_meta.bundle_etag")
+            except Exception as e:
+                print(f"  ⚠ 添加列失败 bundle_etag: {e}")
+
+        # paper_vocabulary.cased：单词是否以大写形式出现过（缩写、专名不做拼写纠错）
+        cursor.execute("PRAGMA table_info(paper_vocabulary)")
+        columns = [col["name"] for col in cursor.fetchall()]
+
+        if "cased" not in columns:
+            try:
+                cursor.execute(
+                    "ALTER TABLE paper_vocabulary ADD COLUMN cased INTEGER DEFAULT 0"
+                )
+                # 旧词表没有大小写信息，删除提取记录，下次打开论文时重新提取
+                cursor.execute("DELETE FROM paper_vocabulary_meta")
+                print("  ✓ 添加列: paper_vocabulary.cased（论文词表将重新提取）")
+            except Exception as e:
+                print(f"  ⚠ 添加列失败 cased: {e}")
+
+        # word_queries.query_date：查询日期（本地时间，与写入时的 datetime.now() 一致；
+        # query_time 是 UTC 的 CURRENT_TIMESTAMP，回填时需转为本地日期），
+        # 过滤条件直接比较该列，索引不会因 DATE() 包装而失效
+        cursor.execute("PRAGMA table_info(word_queries)")
+        columns = [col["name"] for col in cursor.fetchall()]
+
+        if "query_date" not in columns:
+            try:
+                cursor.execute("ALTER TABLE word_queries ADD COLUMN query_date TEXT")
+                # 先回填再建索引，避免逐行更新索引
+                cursor.execute("UPDATE word_queries SET query_date = DATE(query_time, 'localtime')")
+                print(f"  ✓ 添加列: word_queries.query_date（回填 {cursor.rowcount} 行）")
+            except Exception as e:
+                print(f"  ⚠ 添加列失败 query_date: {e}")
+
+        for index_name, index_columns in WORD_QUERY_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON word_queries {index_columns}"
+            )
+
+        # 补齐 query_date 为空的记录（如迁移中断）；走 query_date 索引，通常只需一次查找
+        cursor.execute(
+            "UPDATE word_queries SET query_date = DATE(query_time, 'localtime') WHERE query_date IS NULL"
+        )
+        if cursor.rowcount > 0:
+            print(f"  ✓ 回填 word_queries.query_date: {cursor.rowcount} 行")
+
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
 
     def record_paper(
         self,
@@ -241,7 +402,7 @@ class DatabaseManager:
             ),
         )
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
 
     def mark_paper_as_read(self, arxiv_id):
         """标记论文为已读"""
@@ -259,7 +420,7 @@ class DatabaseManager:
             (arxiv_id,),
         )
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
 
     def record_word_query(
         self,
@@ -270,70 +431,190 @@ class DatabaseManager:
         category=None,
         session_id=None,
     ):
-        """记录单词查询"""
+        """记录单词查询（同步写入）"""
+        event = WordQuery(
+            word.lower(), context, translation, paper_id, category, session_id,
+            datetime.now().date().isoformat(),
+        )
         conn = self.get_connection()
-        cursor = conn.cursor()
-        today = datetime.now().date().isoformat()
+        try:
+            self._write_word_queries(conn.cursor(), [event])
+            conn.commit()
+        finally:
+            self.release_connection(conn)
 
-        # 检查今日是否已查询过
-        cursor.execute(
-            """
-            SELECT id, query_count FROM word_queries 
-            WHERE word = ? AND DATE(query_time) = ? AND session_id = ?
-        """,
-            (word.lower(), today, session_id),
+    def enqueue_word_query(
+        self,
+        word,
+        context=None,
+        translation=None,
+        paper_id=None,
+        category=None,
+        session_id=None,
+    ):
+        """
+        记录单词查询（异步写入）
+
+        事件放入有界队列后立即返回，由后台线程合并后批量写入；
+        队列已满时退化为同步写入，不丢失记录。
+        """
+        event = WordQuery(
+            word.lower(), context, translation, paper_id, category, session_id,
+            datetime.now().date().isoformat(),
         )
-        existing = cursor.fetchone()
-
-        if existing:
-            cursor.execute(
-                """
-                UPDATE word_queries 
-                SET query_count = query_count + 1, 
-                    last_query_time = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (existing["id"],),
+        self._start_query_writer()
+        try:
+            self._query_queue.put_nowait(event)
+        except queue.Full:
+            self.record_word_query(word, context, translation, paper_id, category, session_id)
+
+    def flush_word_queries(self, timeout=10):
+        """
+        等待队列中已有的查询记录全部写入
+
+        Returns:
+            是否在 timeout 秒内写完
+        """
+        if self._query_writer is None:
+            return True
+        done = threading.Event()
+        try:
+            self._query_queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _start_query_writer(self):
+        """启动后台写入线程（只启动一次），并在进程退出时写完剩余记录"""
+        if self._query_writer is not None:
+            return
+        with self._query_writer_lock:
+            if self._query_writer is not None:
+                return
+            self._query_writer = threading.Thread(
+                target=self._query_writer_loop, name="word-query-writer", daemon=True
             )
-        else:
+            self._query_writer.start()
+            atexit.register(self.flush_word_queries)
+
+    def _query_writer_loop(self):
+        """后台写入线程：等待一个事件，再收集 flush 间隔内到达的事件，一个事务写入"""
+        interval = CONFIG["QUERY_LOG_FLUSH_INTERVAL"]
+        while True:
+            items = [self._query_queue.get()]
+            if not isinstance(items[0], threading.Event):
+                # 攒一小段时间，让连续悬停的查询合并到同一个事务
+                time.sleep(interval)
+            while True:
+                try:
+                    items.append(self._query_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            events = [item for item in items if not isinstance(item, threading.Event)]
+            if events:
+                conn = None
+                try:
+                    conn = self.get_connection()
+                    self._write_word_queries(conn.cursor(), events)
+                    conn.commit()
+                except Exception as e:
+                    # 丢弃这一批，写入线程继续运行
+                    print(f"⚠ 写入查询记录失败（{len(events)} 条）: {e}")
+                finally:
+                    if conn is not None:
+                        self.release_connection(conn)
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    @staticmethod
+    def _write_word_queries(cursor, events):
+        """
+        写入一批查询事件（由调用方提交事务）
+
+        同一天、同一会话的同一单词合并为一行，查询次数累加；
+        掌握度和论文查询计数按单词、论文合并后各写一次。
+        """
+        rows = {}
+        for event in events:
+            # 没有会话 ID 的查询不合并，与逐条写入时一样各占一行
+            if event.session_id is None:
+                key = object()
+            else:
+                key = (event.word, event.today, event.session_id)
+            if key in rows:
+                rows[key][1] += 1
+            else:
+                rows[key] = [event, 1]
+
+        for event, count in rows.values():
+            # 检查今日是否已查询过
             cursor.execute(
                 """
-                INSERT INTO word_queries 
-                (word, context, translation, paper_id, category, session_id)
-                VALUES (?, ?, ?, ?, ?, ?)
+                SELECT id, query_count FROM word_queries 
+                WHERE word = ? AND query_date = ? AND session_id = ?
             """,
-                (word.lower(), context, translation, paper_id, category, session_id),
+                (event.word, event.today, event.session_id),
             )
+            existing = cursor.fetchone()
 
-        # 更新单词掌握度
-        cursor.execute(
+            if existing:
+                cursor.execute(
+                    """
+                    UPDATE word_queries 
+                    SET query_count = query_count + ?, 
+                        last_query_time = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """,
+                    (count, existing["id"]),
+                )
+            else:
+                cursor.execute(
+                    """
+                    INSERT INTO word_queries 
+                    (word, context, translation, paper_id, category, session_id,
+                     query_count, query_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (event.word, event.context, event.translation, event.paper_id,
+                     event.category, event.session_id, count, event.today),
+                )
+
+        # 更新单词掌握度：按 (单词, 日期) 合并，日期与查询记录、每日统计一致（查询时的本地日期）
+        mastery = Counter((event.word, event.today) for event in events)
+        cursor.executemany(
             """
             INSERT INTO word_mastery (word, query_count, first_seen, last_seen, review_count)
-            VALUES (?, 1, DATE('now'), DATE('now'), 1)
+            VALUES (?, ?, ?, ?, 1)
             ON CONFLICT(word) DO UPDATE SET
-                query_count = query_count + 1,
-                last_seen = DATE('now'),
+                query_count = query_count + excluded.query_count,
+                last_seen = excluded.last_seen,
                 review_count = CASE 
-                    WHEN DATE(word_mastery.last_seen) != DATE('now') 
+                    WHEN DATE(word_mastery.last_seen) != excluded.last_seen 
                     THEN review_count + 1 
                     ELSE review_count 
                 END
         """,
-            (word.lower(),),
+            [
+                (word, count, today, today)
+                for (word, today), count in sorted(mastery.items(), key=lambda item: item[0][1])
+            ],
         )
 
         # 更新论文查询计数
-        if paper_id:
-            cursor.execute(
-                """
-                UPDATE papers SET query_count = query_count + 1
-                WHERE arxiv_id = ?
-            """,
-                (paper_id,),
-            )
-
-        conn.commit()
-        conn.close()
+        cursor.executemany(
+            """
+            UPDATE papers SET query_count = query_count + ?
+            WHERE arxiv_id = ?
+        """,
+            [
+                (count, paper_id)
+                for paper_id, count in Counter(
+                    event.paper_id for event in events if event.paper_id
+                ).items()
+            ],
+        )
 
     def add_familiar_words(self, words, source="import"):
         """批量添加熟词，返回(添加数量, batch_id)"""
@@ -366,8 +647,11 @@ class DatabaseManager:
                     added += 1
                 except:
                     pass
+        version = self._bump_familiar_words_version(cursor) if added else None
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
+        if version is not None:
+            self._extend_familiar_set(words, version)
         return added, batch_id
 
     def undo_import_batch(self, batch_id):
@@ -396,10 +680,93 @@ class DatabaseManager:
                 (word,),
             )
 
+        if deleted_count:
+            self._bump_familiar_words_version(cursor)
         conn.commit()
-        conn.close()
+        self.release_connection(conn)
+        if deleted_count:
+            # 这些单词可能仍被标记为已掌握，下次读取时重新加载
+            self._invalidate_familiar_set()
         return deleted_count
 
+    @staticmethod
+    def _bump_familiar_words_version(cursor):
+        """熟词表变化时递增版本号（与修改在同一事务中提交），返回新版本号"""
+        cursor.execute(
+            """
+            INSERT INTO user_preferences (key, value, updated_at)
+            VALUES ('familiar_words_version', '1', CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET
+                value = CAST(CAST(value AS INTEGER) + 1 AS TEXT),
+                updated_at = CURRENT_TIMESTAMP
+        """
+        )
+        cursor.execute(
+            "SELECT value FROM user_preferences WHERE key = 'familiar_words_version'"
+        )
+        return int(cursor.fetchone()[0])
+
+    def get_familiar_word_set(self):
+        """
+        用户已熟悉的单词集合：熟词表 + 掌握度表中标记为熟悉或已掌握的单词
+
+        内存中缓存一份，版本号与数据库不一致时（例如其他进程修改了熟词表）重新加载。
+
+        Returns:
+            frozenset，小写单词
+        """
+        version = self.get_familiar_words_version()
+        with self._familiar_lock:
+            if self._familiar_set is not None and self._familiar_set_version == version:
+                return self._familiar_set
+
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT word FROM familiar_words
+                UNION
+                SELECT word FROM word_mastery WHERE is_familiar = 1 OR is_mastered = 1
+            """
+            )
+            words = frozenset(row["word"] for row in cursor.fetchall())
+        finally:
+            self.release_connection(conn)
+
+        with self._familiar_lock:
+            self._familiar_set = words
+            self._familiar_set_version = version
+        return words
+
+    def _extend_familiar_set(self, words, version):
+        """新增熟词后同步内存集合"""
+        with self._familiar_lock:
+            if self._familiar_set is None or self._familiar_set_version != version - 1:
+                # 内存集合不是紧邻的上一版本，下次读取时整体重新加载
+                self._familiar_set = None
+                return
+            added = {w.lower().strip() for w in words if w and len(w.strip()) > 1}
+            self._familiar_set = self._familiar_set | added
+            self._familiar_set_version = version
+
+    def _invalidate_familiar_set(self):
+        with self._familiar_lock:
+            self._familiar_set = None
+
+    def get_familiar_words_version(self):
+        """熟词表版本号，熟词增删后递增，用于判断依赖熟词的缓存是否过期"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT value FROM user_preferences WHERE key = 'familiar_words_version'"
+            )
+            row = cursor.fetchone()
+            return int(row["value"]) if row else 0
+        finally:
+            self.release_connection(conn)
+
     def get_import_batches(self):
         """获取所有导入批次信息"""
         conn = self.get_connection()
@@ -419,7 +786,7 @@ class DatabaseManager:
             print(f"[Database Error] get_import_batches: {e}")
             return []
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def get_familiar_words_with_details(self, limit=100, offset=0, search=""):
         """获取熟词列表及详细信息"""
@@ -472,7 +839,7 @@ class DatabaseManager:
             print(f"[Database Error] get_familiar_words_with_details: {e}")
             return {"words": [], "total": 0}
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def get_familiar_words(self):
         """获取所有熟词"""
@@ -480,9 +847,150 @@ class DatabaseManager:
         cursor = conn.cursor()
         cursor.execute("SELECT word FROM familiar_words")
         words = [row["word"] for row in cursor.fetchall()]
-        conn.close()
+        self.release_connection(conn)
         return words
 
+    def get_most_queried_words(self, limit=5000):
+        """获取查询次数最多的单词（不含已熟悉/已掌握的单词），按查询次数降序"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT word FROM word_mastery
+                WHERE is_familiar = 0 AND is_mastered = 0
+                ORDER BY query_count DESC, last_seen DESC
+                LIMIT ?
+                """,
+                (limit,),
+            )
+            return [row["word"] for row in cursor.fetchall()]
+        finally:
+            self.release_connection(conn)
+
+    def save_paper_vocabulary(self, paper_id, vocabulary, source_mtime, page_count):
+        """
+        保存论文词表（整体替换）
+
+        Args:
+            paper_id: 论文ID
+            vocabulary: (word, count, first_page, cased) 的可迭代对象
+            source_mtime: PDF 文件修改时间
+            page_count: PDF 页数
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM paper_vocabulary WHERE paper_id = ?", (paper_id,))
+            cursor.executemany(
+                """
+                INSERT INTO paper_vocabulary (paper_id, word, count, first_page, cased)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (
+                    (paper_id, word, count, first_page, int(cased))
+                    for word, count, first_page, cased in vocabulary
+                ),
+            )
+            word_count = cursor.execute(
+                "SELECT COUNT(*) FROM paper_vocabulary WHERE paper_id = ?", (paper_id,)
+            ).fetchone()[0]
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO paper_vocabulary_meta
+                (paper_id, source_mtime, page_count, word_count, indexed_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            """,
+                (paper_id, source_mtime, page_count, word_count),
+            )
+            conn.commit()
+            return word_count
+        finally:
+            self.release_connection(conn)
+
+    def get_paper_vocabulary(self, paper_id, source_mtime=None):
+        """
+        获取论文词表
+
+        Args:
+            paper_id: 论文ID
+            source_mtime: 当前 PDF 修改时间，与提取时记录的不一致视为过期
+
+        Returns:
+            [{"word", "count", "first_page", "cased"}, ...]，按单词排序；
+            未提取或已过期时返回 None
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT source_mtime FROM paper_vocabulary_meta WHERE paper_id = ?",
+                (paper_id,),
+            )
+            meta = cursor.fetchone()
+            if meta is None:
+                return None
+            if source_mtime is not None and meta["source_mtime"] != source_mtime:
+                return None
+            cursor.execute(
+                """
+                SELECT word, count, first_page, cased FROM paper_vocabulary
+                WHERE paper_id = ?
+                ORDER BY word
+            """,
+                (paper_id,),
+            )
+            return [
+                {"word": row["word"], "count": row["count"],
+                 "first_page": row["first_page"], "cased": bool(row["cased"])}
+                for row in cursor.fetchall()
+            ]
+        finally:
+            self.release_connection(conn)
+
+    def get_paper_bundle_etag(self, paper_id):
+        """获取论文翻译包的 ETag，未生成时返回 None"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT bundle_etag FROM paper_vocabulary_meta WHERE paper_id = ?",
+                (paper_id,),
+            )
+            row = cursor.fetchone()
+            return row["bundle_etag"] if row else None
+        finally:
+            self.release_connection(conn)
+
+    def set_paper_bundle_etag(self, paper_id, etag):
+        """记录论文翻译包的 ETag"""
+        conn = self.get_connection()
+        try:
+            conn.execute(
+                "UPDATE paper_vocabulary_meta SET bundle_etag = ? WHERE paper_id = ?",
+                (etag, paper_id),
+            )
+            conn.commit()
+        finally:
+            self.release_connection(conn)
+
+    def get_daily_stats(self, days=30):
+        """获取最近 days 天的每日统计"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * FROM daily_stats
+                WHERE date >= DATE('now', ?)
+                ORDER BY date ASC
+                """,
+                (f"-{int(days)} days",),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            self.release_connection(conn)
+
     def get_papers(self, filters=None, limit=100, offset=0):
         """获取论文列表，支持筛选"""
         conn = self.get_connection()
@@ -522,7 +1030,7 @@ class DatabaseManager:
 
         cursor.execute(query, params)
         papers = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        self.release_connection(conn)
         return papers
 
     def get_paper_by_id(self, arxiv_id):
@@ -531,7 +1039,7 @@ class DatabaseManager:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM papers WHERE arxiv_id = ?", (arxiv_id,))
         row = cursor.fetchone()
-        conn.close()
+        self.release_connection(conn)
         return dict(row) if row else None
 
     def start_session(self, session_id, paper_id, category):
@@ -555,10 +1063,12 @@ class DatabaseManager:
             print(f"Session start error: {e}")
             raise
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def end_session(self, session_id, duration_seconds, pages_read=0):
         """结束阅读会话"""
+        # 会话统计需要包含队列中尚未写入的查询
+        self.flush_word_queries()
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -598,12 +1108,13 @@ class DatabaseManager:
             print(f"Session end error: {e}")
             raise
         finally:
-            conn.close()
+            self.release_connection(conn)
 
         self.update_daily_stats()
 
     def update_daily_stats(self):
         """更新每日统计数据"""
+        self.flush_word_queries()
         today = datetime.now().date().isoformat()
         conn = self.get_connection()
         try:
@@ -617,7 +1128,7 @@ class DatabaseManager:
                        COUNT(DISTINCT word) as unique_words,
                        SUM(CASE WHEN query_count > 1 THEN 1 ELSE 0 END) as repeat_queries
                 FROM word_queries
-                WHERE DATE(query_time) = ?
+                WHERE query_date = ?
             """,
                 (today,),
             )
@@ -639,7 +1150,7 @@ class DatabaseManager:
                 """
                 SELECT category, COUNT(*) as count
                 FROM word_queries
-                WHERE DATE(query_time) = ? AND category IS NOT NULL
+                WHERE query_date = ? AND category IS NOT NULL
                 GROUP BY category
             """,
                 (today,),
@@ -727,7 +1238,7 @@ class DatabaseManager:
             conn.commit()
             print(f"✓ 每日统计已更新: {today}")
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def query_stats(self, query_type, **params):
         """统计查询接口"""
@@ -739,16 +1250,18 @@ class DatabaseManager:
             if query_type == "word_frequency":
                 days = params.get("days", 7)
                 limit = params.get("limit", 20)
+                # GROUP BY +word：不让优化器为省去分组排序而全量扫描单词索引，
+                # 而是按日期范围走覆盖索引
                 cursor.execute(
                     """
                     SELECT word, COUNT(*) as count, SUM(query_count) as total
                     FROM word_queries
-                    WHERE query_time >= DATE('now', '-{} days')
-                    GROUP BY word
+                    WHERE query_date >= DATE('now', 'localtime', ?)
+                    GROUP BY +word
                     ORDER BY total DESC
                     LIMIT ?
-                """.format(days),
-                    (limit,),
+                """,
+                    (f"-{int(days)} days", limit),
                 )
                 result = {"words": [dict(row) for row in cursor.fetchall()]}
 
@@ -885,10 +1398,12 @@ class DatabaseManager:
 
             return result
         finally:
-            conn.close()
+            self.release_connection(conn)
 
     def reset_all_data(self, hard_reset=False):
         """重置所有用户数据"""
+        # 先写完队列中的记录，避免重置后又被写回
+        self.flush_word_queries()
         conn = self.get_connection()
         try:
             cursor = conn.cursor()
@@ -898,10 +1413,14 @@ class DatabaseManager:
             cursor.execute("DELETE FROM daily_stats")
             cursor.execute("DELETE FROM word_mastery")
             cursor.execute("DELETE FROM familiar_words")
+            self._bump_familiar_words_version(cursor)
+            self._invalidate_familiar_set()
 
             if hard_reset:
-                # 完全重置：删除所有论文数据
+                # 完全重置：删除所有论文数据（PDF 随之删除，词表一并清空）
                 cursor.execute("DELETE FROM papers")
+                cursor.execute("DELETE FROM paper_vocabulary")
+                cursor.execute("DELETE FROM paper_vocabulary_meta")
             else:
                 # 软重置：只重置阅读状态
                 cursor.execute(
@@ -910,8 +1429,31 @@ class DatabaseManager:
                 )
             conn.commit()
         finally:
-            conn.close()
+            self.release_connection(conn)
+
+
+class _LazyDatabaseManager:
+    """
+    延迟创建的 DatabaseManager 代理
+
+    导入本模块时不建表、不连接数据库；第一次访问属性时才创建实例，
+    之后所有属性访问直接转发给该实例。
+    """
+
+    def __init__(self):
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = DatabaseManager()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
 
 
-# 全局数据库管理器实例
-db_manager = DatabaseManager()
+# 全局数据库管理器实例（首次使用时创建）
+db_manager = _LazyDatabaseManager()
@@ -0,0 +1,263 @@
+"""
+论文词表模块 - 服务端提取 PDF 文本并建立每篇论文的词表
+功能：
+1. 用 pypdf 逐页提取 PDF 文本（可选依赖，未安装时由前端上传文本）
+2. 流式分词，记录每个单词的出现次数和首次出现页码
+3. 词表存入 reading_stats.db，打开论文时只需 paper_id 即可预加载
+4. 把预加载结果生成压缩翻译包 pdfs/<分类>/<id>.vocab.json.gz，按 ETag 缓存
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import CONFIG
+from database import db_manager
+from translation_cache import dictionary_signature
+
+# 按 paper_id 分锁：同一篇论文只提取一次、翻译包只生成一次，不同论文互不阻塞
+_index_locks: Dict[str, threading.Lock] = {}
+_bundle_locks: Dict[str, threading.Lock] = {}
+_paper_locks_guard = threading.Lock()
+
+# 翻译包格式版本，格式或分词规则变化时递增，使旧翻译包失效
+# 2：查不到的单词做拼写纠错，纠正结果带"已纠正为"标记
+BUNDLE_FORMAT_VERSION = 2
+
+
+def _paper_lock(locks: Dict[str, threading.Lock], paper_id: str) -> threading.Lock:
+    """取出 paper_id 对应的锁，不存在时创建（每篇论文一把，数量以论文数为上限）"""
+    with _paper_locks_guard:
+        lock = locks.get(paper_id)
+        if lock is None:
+            lock = locks[paper_id] = threading.Lock()
+        return lock
+
+
+def is_available() -> bool:
+    """是否支持服务端提取（安装了 pypdf）"""
+    return importlib.util.find_spec("pypdf") is not None
+
+
+def find_paper_pdf(paper_id: str, category: Optional[str] = None) -> Optional[str]:
+    """
+    定位论文 PDF：先按分类目录找，再查数据库记录的 local_path，最后扫描各分类目录
+
+    Returns:
+        PDF 绝对路径，找不到时返回 None
+    """
+    pdf_dir = CONFIG["PDF_DIR"]
+    # paper_id / category 来自请求参数，只接受单级名称
+    if not paper_id or os.path.basename(paper_id) != paper_id or paper_id.startswith("."):
+        return None
+    if category and (os.path.basename(category) != category or category.startswith(".")):
+        category = None
+    filename = f"{paper_id}.pdf"
+
+    if category:
+        path = os.path.join(pdf_dir, category, filename)
+        if os.path.isfile(path):
+            return path
+
+    paper = db_manager.get_paper_by_id(paper_id)
+    if paper and paper.get("local_path"):
+        path = os.path.join(pdf_dir, paper["local_path"])
+        if os.path.isfile(path):
+            return path
+
+    if os.path.isdir(pdf_dir):
+        for entry in os.listdir(pdf_dir):
+            path = os.path.join(pdf_dir, entry, filename)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def iter_pdf_pages(pdf_path: str) -> Iterator[str]:
+    """逐页产出 PDF 文本，单页提取失败时产出空串"""
+    # pypdf 导入较慢，首次提取时才导入
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    for page_num, page in enumerate(reader.pages, 1):
+        try:
+            yield page.extract_text() or ""
+        except Exception as e:
+            print(f"⚠ 提取第 {page_num} 页文本失败 {pdf_path}: {e}")
+            yield ""
+
+
+def index_paper(paper_id: str, pdf_path: str, translator, force: bool = False) -> Optional[List[dict]]:
+    """
+    提取论文词表并保存
+
+    Args:
+        paper_id: 论文ID
+        pdf_path: PDF 路径
+        translator: BatchTranslator，用于分词和断词修复
+        force: 已有未过期的词表时也重新提取
+
+    Returns:
+        词表 [{"word", "count", "first_page", "cased"}, ...]，无法提取时返回 None
+    """
+    if not is_available():
+        return None
+    mtime = os.path.getmtime(pdf_path)
+
+    with _paper_lock(_index_locks, paper_id):
+        if not force:
+            vocabulary = db_manager.get_paper_vocabulary(paper_id, source_mtime=mtime)
+            if vocabulary is not None:
+                return vocabulary
+
+        pages = 0
+
+        def counted_pages():
+            nonlocal pages
+            for text in iter_pdf_pages(pdf_path):
+                pages += 1
+                yield text
+
+        try:
+            entries = list(translator.tokenize_pages(counted_pages()))
+        except Exception as e:
+            print(f"✗ 提取论文文本失败 {paper_id}: {e}")
+            return None
+        db_manager.save_paper_vocabulary(paper_id, entries, mtime, pages)
+        print(f"✓ 论文词表已建立: {paper_id}（{pages} 页，{len(entries)} 个单词）")
+
+    return [
+        {"word": word, "count": count, "first_page": first_page, "cased": cased}
+        for word, count, first_page, cased in entries
+    ]
+
+
+def get_paper_vocabulary(paper_id: str, translator,
+                         category: Optional[str] = None) -> Optional[List[dict]]:
+    """
+    获取论文词表，未提取或 PDF 已更新时先提取（懒加载）
+
+    Returns:
+        词表，找不到 PDF 或无法提取时返回 None
+    """
+    pdf_path = find_paper_pdf(paper_id, category)
+    if pdf_path is None:
+        return None
+    vocabulary = db_manager.get_paper_vocabulary(
+        paper_id, source_mtime=os.path.getmtime(pdf_path)
+    )
+    if vocabulary is not None:
+        return vocabulary
+    return index_paper(paper_id, pdf_path, translator)
+
+
+def index_paper_async(paper_id: str, pdf_path: str, translator) -> None:
+    """在后台线程中提取论文词表（下载完成后调用）"""
+    if not is_available():
+        return
+    thread = threading.Thread(
+        target=index_paper, args=(paper_id, pdf_path, translator), daemon=True
+    )
+    thread.start()
+
+
+def bundle_path(pdf_path: str) -> str:
+    """翻译包路径：与 PDF 同目录的 <id>.vocab.json.gz"""
+    return os.path.splitext(pdf_path)[0] + ".vocab.json.gz"
+
+
+def bundle_etag(paper_id: str, pdf_path: str, dict_path: str) -> str:
+    """
+    翻译包的强 ETag
+
+    由 PDF 修改时间、词典签名和熟词表版本共同决定，任一变化即生成新的翻译包。
+    """
+    key = "|".join((
+        str(BUNDLE_FORMAT_VERSION),
+        paper_id,
+        repr(os.path.getmtime(pdf_path)),
+        dictionary_signature(dict_path),
+        str(db_manager.get_familiar_words_version()),
+    ))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def locate_bundle(paper_id: str, translator,
+                  category: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """
+    计算论文翻译包当前应有的 ETag（不读写翻译包）
+
+    Returns:
+        (PDF 路径, ETag)，找不到 PDF 时返回 None
+    """
+    pdf_path = find_paper_pdf(paper_id, category)
+    if pdf_path is None:
+        return None
+    return pdf_path, bundle_etag(paper_id, pdf_path, translator.dict_path)
+
+
+def get_translation_bundle(paper_id: str, pdf_path: str, etag: str, translator) -> Optional[str]:
+    """
+    获取论文翻译包，不存在或已过期时重新生成
+
+    Args:
+        paper_id: 论文ID
+        pdf_path: PDF 路径（locate_bundle 的返回值）
+        etag: 当前 ETag（locate_bundle 的返回值）
+        translator: BatchTranslator
+
+    Returns:
+        翻译包路径（gzip 压缩的 JSON），无法提取论文文本时返回 None
+    """
+    path = bundle_path(pdf_path)
+    if os.path.isfile(path) and db_manager.get_paper_bundle_etag(paper_id) == etag:
+        return path
+
+    with _paper_lock(_bundle_locks, paper_id):
+        if os.path.isfile(path) and db_manager.get_paper_bundle_etag(paper_id) == etag:
+            return path
+
+        category = os.path.basename(os.path.dirname(pdf_path))
+        vocabulary = get_paper_vocabulary(paper_id, translator, category)
+        if vocabulary is None:
+            return None
+        # 熟词表版本已计入 ETag，翻译包中直接去掉熟词
+        familiar = db_manager.get_familiar_word_set()
+        words = [entry["word"] for entry in vocabulary if entry["word"] not in familiar]
+        # 缩写和专名查不到时不做拼写纠错
+        results = translator.batch_translate(
+            words, correct=[entry["word"] for entry in vocabulary
+                            if not entry["cased"] and entry["word"] not in familiar]
+        )
+        if any(r.translation.startswith("[翻译错误]") for r in results.values()):
+            # 词典暂时不可用，不把错误结果固化进翻译包
+            return None
+        payload = {
+            "paper_id": paper_id,
+            "source": "bundle",
+            "total_words": len(words),
+            "familiar_skipped": len(vocabulary) - len(words),
+            "translations": {
+                word: {
+                    "translation": result.translation,
+                    "phonetic": result.phonetic,
+                    "meaning": result.meaning,
+                    "is_cached": True,
+                }
+                for word, result in results.items()
+            },
+        }
+
+        # 先写临时文件再替换，读取方不会看到写了一半的翻译包
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp_path, path)
+        db_manager.set_paper_bundle_etag(paper_id, etag)
+        print(f"✓ 翻译包已生成: {paper_id}（{len(words)} 个单词，"
+              f"{os.path.getsize(path) / 1024:.1f} KB）")
+    return path
@@ -1,8 +1,8 @@
 """API 路由模块 - 处理所有 HTTP 路由"""
 
+import gzip
 import os
 import time
-import sqlite3
 import shutil
 import re
 from flask import Flask, render_template, jsonify, request, send_from_directory
@@ -12,8 +12,9 @@ from config import CONFIG
 from constants import ARXIV_CATEGORIES
 from utils import error_handler
 from database import db_manager
-from downloaders import ArxivDownloader
-from translators import call_translator, get_global_batch_translator
+from translators import call_translator, get_dictionary_status, get_global_batch_translator
+from batch_translator import iter_text_chunks
+import paper_vocabulary
 
 # 创建 Flask 应用
 app = Flask(
@@ -73,6 +74,8 @@ def get_papers():
 @error_handler
 def search_papers():
     """搜索论文"""
+    from downloaders import ArxivDownloader  # arxiv / requests 按需导入
+
     data = request.json or {}
     query = data.get("query", "")
     category = data.get("category")
@@ -101,6 +104,8 @@ def search_papers():
 @error_handler
 def get_latest_papers_api():
     """获取最新论文"""
+    from downloaders import ArxivDownloader
+
     categories = (
         request.args.get("categories", "").split(",")
         if request.args.get("categories")
@@ -127,6 +132,8 @@ def get_latest_papers_api():
 @error_handler
 def download_paper():
     """下载论文"""
+    from downloaders import ArxivDownloader
+
     if request.method == "OPTIONS":
         return jsonify({"status": "ok"}), 200
 
@@ -164,6 +171,10 @@ def download_paper():
                 pdf_url=paper_info["pdf_url"],
                 local_path=local_path,
             )
+            # 后台提取论文词表，首次打开时无需再上传文本
+            paper_vocabulary.index_paper_async(
+                arxiv_id, result, get_global_batch_translator()
+            )
             return jsonify(
                 {
                     "success": True,
@@ -186,6 +197,8 @@ def download_paper():
 @error_handler
 def get_paper_detail(arxiv_id):
     """获取论文详情"""
+    from downloaders import ArxivDownloader
+
     # 先查本地
     paper = db_manager.get_paper_by_id(arxiv_id)
 
@@ -247,7 +260,8 @@ def translate_word():
     paper_id = data.get("paper_id", "")
     category = data.get("category", "")
 
-    db_manager.record_word_query(
+    # 查询记录由后台线程批量写入，响应不等待磁盘
+    db_manager.enqueue_word_query(
         word=word,
         context=context,
         translation=translation,
@@ -292,8 +306,10 @@ def batch_translate():
             if clean_word and len(clean_word) >= 2:
                 clean_words.append(clean_word)
 
-    # 去重
-    clean_words = list(set(clean_words))
+    # 去重，并跳过用户已熟悉的单词
+    familiar = db_manager.get_familiar_word_set()
+    unique_words = set(clean_words)
+    clean_words = [w for w in unique_words if w not in familiar]
 
     translator = get_global_batch_translator()
 
@@ -316,6 +332,7 @@ def batch_translate():
             "words": response_data,
             "total": len(clean_words),
             "cached": sum(1 for r in results.values() if r.is_cached),
+            "familiar_skipped": len(unique_words) - len(clean_words),
         }
     )
 
@@ -324,8 +341,9 @@ def batch_translate():
 @error_handler
 def preload_paper_translations():
     """
-    预加载论文翻译 - 从PDF文本中提取并翻译所有单词
-    接收PDF文本内容，返回所有单词的翻译
+    预加载论文翻译 - 翻译论文中的所有单词
+    优先使用服务端从 PDF 提取的词表（只需 paper_id），
+    服务端无法提取时使用前端上传的 PDF 文本
     """
     if request.method == "OPTIONS":
         return jsonify({"status": "ok"}), 200
@@ -336,19 +354,39 @@ def preload_paper_translations():
 
     text_content = data.get("text", "")
     paper_id = data.get("paper_id", "")
+    category = data.get("category")
 
-    if not text_content:
-        return jsonify({"error": "No text content provided"}), 400
+    if not text_content and not paper_id:
+        return jsonify({"error": "No text content or paper_id provided"}), 400
 
     translator = get_global_batch_translator()
 
     # 提取单词
     start_time = time.time()
-    words = translator.extract_words_from_text(text_content)
+    if text_content:
+        source = "upload"
+        vocabulary = [
+            {"word": word, "count": count, "cased": cased}
+            for word, count, cased in translator.tokenize_stream(iter_text_chunks(text_content))
+        ]
+    else:
+        source = "server"
+        vocabulary = paper_vocabulary.get_paper_vocabulary(paper_id, translator, category)
+        if vocabulary is None:
+            # 找不到 PDF 或未安装 pypdf：前端改为上传文本
+            return jsonify({"error": "服务端无法提取该论文文本", "needs_text": True}), 404
+    words = [entry["word"] for entry in vocabulary]
+    # 缩写和专名（原文中以大写形式出现）查不到时不做拼写纠错
+    cased = {entry["word"] for entry in vocabulary if entry["cased"]}
     extract_time = (time.time() - start_time) * 1000
 
-    # 批量翻译
-    results = translator.batch_translate(words)
+    # 跳过用户已熟悉的单词，不查词典也不返回
+    familiar = db_manager.get_familiar_word_set()
+    all_count = len(words)
+    words = [w for w in words if w not in familiar]
+
+    # 批量翻译，查不到的单词尝试拼写纠错
+    results = translator.batch_translate(words, correct=[w for w in words if w not in cased])
 
     # 转换为JSON格式
     translations = {}
@@ -363,13 +401,60 @@ def preload_paper_translations():
     return jsonify(
         {
             "paper_id": paper_id,
+            "source": source,
             "total_words": len(words),
+            "familiar_skipped": all_count - len(words),
             "extract_time_ms": round(extract_time, 2),
             "translations": translations,
         }
     )
 
 
+@app.route("/api/translate/preload/<paper_id>")
+@error_handler
+def get_paper_translation_bundle(paper_id):
+    """
+    论文翻译包 - 预加载结果的压缩 JSON，带强 ETag
+    浏览器再次打开同一论文时只需一次 304 验证
+    """
+    translator = get_global_batch_translator()
+    located = paper_vocabulary.locate_bundle(
+        paper_id, translator, request.args.get("category")
+    )
+    if located is None:
+        return jsonify({"error": "论文不存在", "needs_text": True}), 404
+    pdf_path, etag = located
+
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        path = paper_vocabulary.get_translation_bundle(paper_id, pdf_path, etag, translator)
+        if path is None:
+            return jsonify({"error": "服务端无法提取该论文文本", "needs_text": True}), 404
+        with open(path, "rb") as f:
+            data = f.read()
+        if "gzip" in request.accept_encodings:
+            response = app.response_class(data, mimetype="application/json")
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = app.response_class(gzip.decompress(data), mimetype="application/json")
+
+    response.set_etag(etag)
+    # 允许浏览器缓存，但每次使用前都要验证 ETag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+@app.route("/api/ready")
+def readiness():
+    """就绪检查：词典可用时返回 200，否则返回 503"""
+    status = get_dictionary_status()
+    return jsonify({"ready": status["ready"], "dictionary": status}), (
+        200 if status["ready"] else 503
+    )
+
+
 @app.route("/api/translate/cache/stats")
 @error_handler
 def get_translation_cache_stats():
@@ -406,21 +491,7 @@ def query_statistics(query_type):
 def get_daily_stats():
     """获取每日统计数据"""
     days = request.args.get("days", 30, type=int)
-    conn = sqlite3.connect(CONFIG["DB_PATH"])
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT * FROM daily_stats
-        WHERE date >= DATE('now', '-{} days')
-        ORDER BY date ASC
-    """.format(days)
-    )
-
-    stats = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return jsonify(stats)
+    return jsonify(db_manager.get_daily_stats(days))
 
 
 # ==================== 会话管理路由 ====================
@@ -393,7 +393,10 @@ class PaperReader {
             this.wordCount.clear();
             this.updateStats();
 
-            // 收集所有页面的文本内容用于预加载
+            // 优先使用服务端提取的论文词表预加载（只发送 paper_id），与页面渲染并行
+            const serverPreload = this.preloadTranslations();
+
+            // 收集所有页面的文本内容，服务端无法提取时上传
             let allTextContent = [];
 
             // 渲染所有页面
@@ -404,8 +407,12 @@ class PaperReader {
                 }
             }
 
-            // 开始后台预加载翻译
-            this.preloadTranslations(allTextContent.join(' '));
+            // 服务端预加载失败时，上传文本后台预加载翻译
+            serverPreload.then(ok => {
+                if (!ok) {
+                    this.preloadTranslations(allTextContent.join(' '));
+                }
+            });
 
             // 标记为已读
             fetch('/api/session/start', {
@@ -622,24 +629,31 @@ class PaperReader {
     }
 
     // ===== 预加载翻译 =====
+    // 不传 textContent 时由服务端按 paper_id 提取词表；返回是否预加载成功
     async preloadTranslations(textContent) {
-        if (!textContent || this.isPreloading) return;
+        if (this.isPreloading) return false;
 
         this.isPreloading = true;
         console.log('开始预加载论文单词翻译...');
 
         try {
-            // 调用批量预加载API
-            const response = await fetch('/api/translate/preload', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    text: textContent,
-                    paper_id: this.currentPaperId
+            // 服务端翻译包走 GET，由浏览器按 ETag 缓存；上传文本走 POST
+            const response = textContent
+                ? await fetch('/api/translate/preload', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ text: textContent, paper_id: this.currentPaperId })
                 })
-            });
+                : await fetch(
+                    `/api/translate/preload/${encodeURIComponent(this.currentPaperId)}` +
+                    `?category=${encodeURIComponent(this.currentCategory)}`
+                );
 
             if (!response.ok) {
+                if (!textContent) {
+                    console.log('服务端未提供论文词表，改为上传文本预加载');
+                    return false;
+                }
                 throw new Error(`预加载失败: ${response.status}`);
             }
 
@@ -655,9 +669,11 @@ class PaperReader {
                 console.log(`✓ 预加载完成: ${data.total_words} 个单词`);
                 console.log(`  - 已缓存: ${this.translationCache.size} 个`);
             }
+            return true;
         } catch (e) {
             console.warn('预加载翻译失败:', e);
             // 预加载失败不影响正常使用，继续即可
+            return false;
         } finally {
             this.isPreloading = false;
         }
@@ -6,12 +6,12 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 
 from config import CONFIG, FETCHER_CONFIG
-from routes import app as main_app
-from get_passage import ArxivRSSFetcher
 
 
 def background_fetcher():
     """后台自动获取论文"""
+    from get_passage import ArxivRSSFetcher
+
     while True:
         try:
             print("🔄 后台获取论文...")
@@ -33,8 +33,44 @@ def background_fetcher():
             time.sleep(3600)
 
 
+def cache_warmer():
+    """启动时预热翻译缓存：用户查询最多的单词 + 词频最高的单词"""
+    from database import db_manager
+    from translators import get_global_batch_translator
+
+    try:
+        translator = get_global_batch_translator()
+        user_words = []
+        if CONFIG["CACHE_WARMUP_USER_WORDS"] > 0:
+            user_words = db_manager.get_most_queried_words(CONFIG["CACHE_WARMUP_USER_WORDS"])
+        print(f"🔥 预热翻译缓存（常查单词 {len(user_words)} 个，"
+              f"高频词 {CONFIG['CACHE_WARMUP_TOP_WORDS']} 个）...")
+
+        reported = [0]
+
+        def report(done, total):
+            # 每完成约 20% 输出一次进度
+            percent = done * 100 // total if total else 100
+            if percent >= reported[0] + 20 or done == total:
+                reported[0] = percent
+                print(f"  预热进度: {done}/{total} ({percent}%)")
+
+        summary = translator.warm_up(
+            user_words,
+            top_words=CONFIG["CACHE_WARMUP_TOP_WORDS"],
+            exclude=db_manager.get_familiar_word_set(),
+            progress_callback=report,
+        )
+        print(f"✓ 翻译缓存预热完成: {summary['words']} 个单词"
+              f"（新查询 {summary['loaded']} 个，用时 {summary['seconds']:.1f} 秒）")
+    except Exception as e:
+        print(f"⚠ 翻译缓存预热失败: {e}")
+
+
 def run_stats_server():
     """在8605端口运行统计服务器"""
+    from routes import app as main_app
+
     stats_app = Flask(__name__)
     CORS(stats_app)
 
@@ -122,6 +158,11 @@ def start_background_services(enable_fetch=False):
     else:
         print("ℹ️ 后台论文获取已禁用（使用 --fetch 参数启用）")
 
+    # 预热翻译缓存（后台线程，不阻塞服务器启动）
+    if CONFIG["CACHE_WARMUP_ENABLED"]:
+        warmup_thread = threading.Thread(target=cache_warmer, daemon=True)
+        warmup_thread.start()
+
     # 启动统计服务器（在另一个线程）
     stats_thread = threading.Thread(target=run_stats_server, daemon=True)
     stats_thread.start()
@@ -3,163 +3,869 @@ ECDICT 单文件翻译工具
 功能：
 1. 自动将 ecdict.csv 转换为轻量级 ecdict.db (SQLite)
 2. 提供查询单词、模糊搜索等接口
+3. 可选将词典编译为只读二进制格式 ecdict.bin，通过 mmap 查询
 """
 
 import sqlite3
 import csv
+import itertools
+import mmap
 import os
+import re
+import struct
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from collections import Counter
+from typing import Optional, List, Dict, Any, Iterator, Set
+
+
+# words 表的列顺序，编译格式的记录按此顺序存放字段
+COLUMNS = ('word', 'phonetic', 'definition', 'translation', 'pos', 'collins', 'oxford',
+           'tag', 'bnc', 'frq', 'exchange', 'detail', 'audio')
+_INT_COLUMNS = frozenset(('collins', 'oxford', 'bnc', 'frq'))
+
+# 与 SQLite 的 lower() / NOCASE 一致，只折叠 ASCII 字母
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+# ECDICT 的 frq（当代语料库）和 bnc（英国国家语料库）是词频排名，越小越常用，0/空表示无数据
+RANK_SQL = ("CASE WHEN CAST(frq AS INTEGER) > 0 THEN CAST(frq AS INTEGER) "
+            "WHEN CAST(bnc AS INTEGER) > 0 THEN CAST(bnc AS INTEGER) "
+            "ELSE 1000000000 END")
+
+# exchange 中表示变形的类型：过去式、过去分词、现在分词、第三人称单数、复数、比较级、最高级
+EXCHANGE_FORM_TYPES = frozenset('pdi3srt')
+
+# 前缀索引：预存前缀按词频排名的前 PREFIX_INDEX_TOP_K 个单词。长度不超过 PREFIX_INDEX_DEPTH 的
+# 前缀全部收录；更长的前缀只收录匹配超过 PREFIX_SCAN_LIMIT 个单词的，其余范围扫描后排序
+PREFIX_INDEX_DEPTH = 4
+PREFIX_INDEX_TOP_K = 10
+PREFIX_SCAN_LIMIT = 200
+
+# 词典结构版本，记录在 PRAGMA user_version 中，低于此版本时由 migrate() 升级
+# 1：前缀索引收录匹配较多的长前缀
+DICT_SCHEMA_VERSION = 1
+
+# 拼写纠错（SymSpell 删除索引）：对有词频排名的单词，取前 SPELL_PREFIX_LENGTH 个字母，
+# 预存删除 0~SPELL_MAX_DISTANCE 个字母后的所有变体；每个变体最多保留 SPELL_BUCKET_SIZE 个单词。
+# 只纠正不短于 SPELL_MIN_LENGTH 的单词：更短的单词与常用词只差一个字母的情况太多（bert → best）
+SPELL_MAX_DISTANCE = 1
+SPELL_MIN_LENGTH = 6
+SPELL_PREFIX_LENGTH = 7
+SPELL_BUCKET_SIZE = 64
+_SPELL_WORD = re.compile(r'^[a-z]{3,}$')
+
+
+# 中文反向查询的全文索引：每个汉字作为一个独立词元
+_CJK_CHAR = re.compile(r'([\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff])')
+
+
+def cjk_spaced(text: str) -> str:
+    """在每个汉字两侧加空格，使 FTS5 unicode61 分词器把单个汉字切成一个词元"""
+    return _CJK_CHAR.sub(r' \1 ', text or '')
+
+
+def fold_key(word: str) -> str:
+    """查询键：去空白并折叠 ASCII 大小写"""
+    return word.strip().translate(_ASCII_LOWER)
+
+
+def spell_deletes(word: str, max_distance: int = SPELL_MAX_DISTANCE) -> set:
+    """word 删除 0~max_distance 个字母后得到的全部字符串（含 word 本身）"""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    受限的 Damerau-Levenshtein 距离（相邻交换算一次编辑）
+
+    超过 max_distance 时提前返回 max_distance + 1。
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_distance:
+            return max_distance + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class CompiledDict:
+    """
+    编译后的只读词典（mmap）
+
+    文件布局（小端）：
+        header  magic(4s) version(I) count(I) index_offset(Q) data_offset(Q)
+        data    依次存放每个条目的查询键（UTF-8）和记录（字段以 \\x1f 分隔）
+        index   count 个 (key_offset Q, key_len I, rec_offset Q, rec_len I)，按查询键字节序排序
+
+    查询时在 index 上二分，只在命中后解码记录。多个进程打开同一文件时
+    共享操作系统页缓存，无需把整个词典读进各自的堆内存。
+    """
+
+    MAGIC = b'ECDB'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sIIQQ')
+    _ENTRY = struct.Struct('<QIQI')
+    _SEP = '\x1f'
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._index_offset, _ = self._HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._mm.close()
+            raise ValueError(f"不是有效的编译词典文件: {self.path}")
+
+    @classmethod
+    def build(cls, rows, path: str) -> int:
+        """
+        写入编译词典
+
+        Args:
+            rows: 按 fold_key(word) 的 UTF-8 字节序排好序的行（COLUMNS 顺序的序列）
+            path: 输出路径，先写临时文件再原子替换
+
+        Returns:
+            写入的条目数
+        """
+        tmp_path = f"{path}.tmp"
+        index = bytearray()
+        count = 0
+        with open(tmp_path, 'wb') as f:
+            f.write(b'\0' * cls._HEADER.size)
+            offset = cls._HEADER.size
+            for row in rows:
+                key = fold_key(row[0]).encode('utf-8')
+                record = cls._SEP.join(
+                    '' if v is None else str(v).replace(cls._SEP, ' ') for v in row
+                ).encode('utf-8')
+                f.write(key)
+                f.write(record)
+                index += cls._ENTRY.pack(offset, len(key), offset + len(key), len(record))
+                offset += len(key) + len(record)
+                count += 1
+            f.write(index)
+            f.seek(0)
+            f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, count, offset, cls._HEADER.size))
+        os.replace(tmp_path, path)
+        return count
+
+    def _lower_bound(self, key: bytes) -> int:
+        """第一个查询键 >= key 的条目序号"""
+        mm, entry, base = self._mm, self._ENTRY, self._index_offset
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) >> 1
+            key_offset, key_len, _, _ = entry.unpack_from(mm, base + mid * 24)
+            if mm[key_offset:key_offset + key_len] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _decode(self, rec_offset: int, rec_len: int) -> Dict[str, Any]:
+        fields = self._mm[rec_offset:rec_offset + rec_len].decode('utf-8').split(self._SEP)
+        record = dict(zip(COLUMNS, fields))
+        for name in _INT_COLUMNS:
+            value = record.get(name)
+            record[name] = int(value) if value and value.isdigit() else value
+        return record
+
+    def get(self, word: str) -> Optional[Dict[str, Any]]:
+        """精确查询，大小写不同的同形词优先返回完全匹配的一条"""
+        word = word.strip()
+        key = fold_key(word).encode('utf-8')
+        mm, entry, base = self._mm, self._ENTRY, self._index_offset
+
+        first = None
+        i = self._lower_bound(key)
+        while i < self.count:
+            key_offset, key_len, rec_offset, rec_len = entry.unpack_from(mm, base + i * 24)
+            if mm[key_offset:key_offset + key_len] != key:
+                break
+            record = self._decode(rec_offset, rec_len)
+            if record['word'] == word:
+                return record
+            if first is None:
+                first = record
+            i += 1
+        return first
+
+    def close(self) -> None:
+        self._mm.close()
 
 
 class ECDict:
     """ECDICT 词典工具类"""
 
-    def __init__(self, csv_file: str = "ecdict.csv", db_file: str = "ecdict.db"):
+    def __init__(self, csv_file: str = "ecdict.csv", db_file: str = "ecdict.db",
+                 pool_size: int = 16, compiled_file: Optional[str] = None):
         """
         初始化词典
 
         Args:
             csv_file: 词典源文件路径
             db_file: 生成的数据库路径
+            pool_size: 连接池保留的空闲只读连接数上限
+            compiled_file: 编译词典路径，默认为 db_file 同名的 .bin 文件
         """
         self.csv_file = Path(csv_file)
         self.db_file = Path(db_file)
-        # 移除实例级别的连接，改用每次查询时创建新连接
-        self.conn: Optional[sqlite3.Connection] = None
+        self.compiled_file = Path(compiled_file) if compiled_file else self.db_file.with_suffix('.bin')
+        self._compiled: Optional[CompiledDict] = None
+        self._compiled_checked = False
+        # 只读连接池：每个并发查询独占一个只读连接，互不阻塞。
+        # 空闲连接放在普通列表里：list.pop / append 在 CPython 中是原子操作，
+        # 借还连接无需加锁（queue.Queue 每次借还都要获取锁和条件变量，开销与一次查询相当）
+        self.pool_size = pool_size
+        self._idle: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
 
         # 确保数据库文件存在且可访问
         if not self.db_file.exists():
             print(f"警告: 数据库文件不存在 {self.db_file}")
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """获取数据库连接（单例模式）"""
-        if self.conn is None:
+    def _open_readonly(self) -> sqlite3.Connection:
+        """
+        打开一个只读连接
+
+        不执行任何写操作，词典文件本身只读时也能打开；
+        旧版词典缺失的索引由 migrate() 在启动阶段补建。
+        """
+        try:
+            if not self.db_file.exists():
+                raise FileNotFoundError(
+                    f"数据库文件不存在: {self.db_file}。请先调用 build_db() 方法构建数据库。"
+                )
+
+            # mode=ro + immutable=1：不加文件锁、不检查日志文件，
+            # 多线程读取不会出现 "database is locked"
+            uri = f"{self.db_file.resolve().as_uri()}?mode=ro&immutable=1"
+            # 连接会在线程间归还复用，同一时刻只被一个线程使用
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row  # 返回字典格式
+            # 通过 mmap 读取页面，各连接共享操作系统页缓存
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA cache_size=-8000")
+            return conn
+        except Exception as e:
+            print(f"数据库连接错误: {e}")
+            raise
+
+    def _get_compiled(self) -> Optional[CompiledDict]:
+        """
+        打开编译词典（若存在且不比 ecdict.db 旧）
+
+        ecdict.db 重建后旧的 .bin 会被忽略，直到重新调用 compile()。
+        """
+        if not self._compiled_checked:
+            with self._pool_lock:
+                if not self._compiled_checked:
+                    try:
+                        if (self.compiled_file.exists() and (
+                                not self.db_file.exists()
+                                or self.compiled_file.stat().st_mtime >= self.db_file.stat().st_mtime)):
+                            self._compiled = CompiledDict(str(self.compiled_file))
+                    except (OSError, ValueError) as e:
+                        print(f"编译词典不可用，改用 SQLite: {e}")
+                    self._compiled_checked = True
+        return self._compiled
+
+    def compile(self, output_file: Optional[str] = None) -> int:
+        """
+        将 ecdict.db 编译为 mmap 只读格式
+
+        Args:
+            output_file: 输出路径，默认为 self.compiled_file
+
+        Returns:
+            编译的条目数
+        """
+        output = Path(output_file) if output_file else self.compiled_file
+        print(f"正在编译词典: {output}")
+        with self._connection() as conn:
+            # lower() 与 fold_key 一样只折叠 ASCII，BINARY 排序即 UTF-8 字节序
+            cursor = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM words "
+                f"ORDER BY lower(trim(word)), word != lower(trim(word)), word"
+            )
+            count = CompiledDict.build(cursor, str(output))
+        print(f"✓ 编译完成！共 {count} 个条目，{output.stat().st_size / 1024 / 1024:.2f} MB")
+
+        # 让后续查询使用新文件
+        with self._pool_lock:
+            if self._compiled is not None:
+                self._compiled.close()
+            self._compiled = None
+            self._compiled_checked = False
+        return count
+
+    def _acquire(self) -> sqlite3.Connection:
+        """借出一个空闲的只读连接，没有时新建"""
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return self._open_readonly()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """归还连接，空闲连接已满时关闭"""
+        if len(self._idle) < self.pool_size:
+            self._idle.append(conn)
+        else:
+            conn.close()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """从连接池借出一个只读连接，用完自动归还"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    # migrate() 补建的表和索引
+    _MIGRATED_OBJECTS = ('idx_word_nocase', 'prefix_index', 'lemmas', 'spell_words', 'spell_deletes',
+                         'words_fts', 'fts_rank')
+
+    def migrate(self) -> bool:
+        """
+        一次性维护旧版词典（启动阶段由 translators.init_dictionary 调用）
+
+        先用只读连接检查，需要维护时才打开一个临时的可写连接：
+        - 旧版连接把词典切到了 WAL 模式，这里切回 DELETE 模式，
+          保证 immutable 只读连接能看到全部数据
+        - 补建缺失的索引（含中文反向查询全文索引，SQLite 未启用 FTS5 时跳过）
+
+        连接池始终只使用只读连接，查询线程不会等待补建索引。
+
+        Returns:
+            词典是否已是最新结构；文件只读等原因无法维护时返回 False，
+            缺失索引的功能（前缀搜索、拼写纠错等）不可用
+        """
+        if not self.db_file.exists():
+            raise FileNotFoundError(
+                f"数据库文件不存在: {self.db_file}。请先调用 build_db() 方法构建数据库。"
+            )
+        # 文件头第 18 字节为 2 表示 WAL 模式；immutable 连接不读 -wal 文件，先检查
+        with open(self.db_file, 'rb') as f:
+            wal_mode = f.read(20)[18:19] == b'\x02'
+        if not wal_mode:
+            with self._connection() as conn:
+                placeholders = ','.join('?' * len(self._MIGRATED_OBJECTS))
+                present = dict(conn.execute(
+                    f"SELECT name, sql FROM sqlite_master WHERE name IN ({placeholders})",
+                    self._MIGRATED_OBJECTS,
+                ).fetchall())
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if (len(present) == len(self._MIGRATED_OBJECTS)
+                    and version >= DICT_SCHEMA_VERSION
+                    and not self._fts_outdated(present['words_fts'])):
+                return True
+
+        try:
+            conn = sqlite3.connect(str(self.db_file), timeout=30)
             try:
-                if not self.db_file.exists():
-                    raise FileNotFoundError(
-                        f"数据库文件不存在: {self.db_file}。请先调用 build_db() 方法构建数据库。"
-                    )
-                # 使用 check_same_thread=False 允许在不同线程中访问
-                self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
-                self.conn.row_factory = sqlite3.Row  # 返回字典格式
-                # 设置超时时间
-                self.conn.execute("PRAGMA timeout=30000")
-                # 确保连接是可写的
-                self.conn.execute("PRAGMA writable_schema=ON")
-                # 设置默认的事务隔离级别
-                self.conn.execute("PRAGMA journal_mode=WAL")
-                # 设置默认的锁超时时间
-                self.conn.execute("PRAGMA locking_mode=EXCLUSIVE")
-                # 设置默认的同步模式
-                self.conn.execute("PRAGMA synchronous=NORMAL")
-                # 设置默认的缓存大小
-                self.conn.execute("PRAGMA cache_size=1000")
-                # 设置默认的页面大小
-                self.conn.execute("PRAGMA page_size=4096")
-                # 设置默认的最大内存使用量
-                self.conn.execute("PRAGMA max_page_count=1000000")
-                # 设置默认的自动真空
-                self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
-            except Exception as e:
-                print(f"数据库连接错误: {e}")
-                raise
-        return self.conn
-
-    def build_db(self, batch_size: int = 5000) -> None:
+                conn.execute("PRAGMA journal_mode=DELETE")
+                self._ensure_lookup_index(conn)
+                self._ensure_prefix_index(conn)
+                self._ensure_lemma_index(conn)
+                self._ensure_spell_index(conn)
+                self._ensure_fts(conn)
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            print(f"⚠ 无法维护词典 {self.db_file}（{e}），部分功能不可用")
+            return False
+        # 只读连接按不可变文件打开，维护后重新连接才能看到新表
+        self.close()
+        return True
+
+    @staticmethod
+    def _ensure_lookup_index(conn: sqlite3.Connection) -> None:
+        """
+        确保存在大小写无关的查询索引
+
+        旧版 build_db 只建了 idx_word（区分大小写），search 使用
+        lower(word) = lower(?) 时无法命中任何索引，每次查询都会全表扫描。
+        这里为已有数据库补建 NOCASE 索引，只在第一次打开时执行一次。
+        """
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_word_nocase'"
+        ).fetchone()
+        if row is None:
+            print("正在为词典创建大小写无关索引（仅首次执行）...")
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_word_nocase ON words(word COLLATE NOCASE)')
+            conn.commit()
+
+    @classmethod
+    def _ensure_prefix_index(cls, conn: sqlite3.Connection) -> None:
+        """旧版数据库没有前缀索引，或前缀索引未收录长前缀时补建"""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'prefix_index'"
+        ).fetchone()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if row is None or version < DICT_SCHEMA_VERSION:
+            print("正在为词典创建前缀索引（仅首次执行）...")
+            cls._build_prefix_index(conn)
+
+    @staticmethod
+    def _build_prefix_index(conn: sqlite3.Connection) -> None:
+        """
+        构建前缀索引表 prefix_index
+
+        1. 逐层统计长于 PREFIX_INDEX_DEPTH 的前缀的匹配数，找出超过 PREFIX_SCAN_LIMIT 的
+           （如 inter、trans）。子前缀的匹配集合包含于父前缀，只需展开上一层超限的前缀
+        2. 按词频排名顺序扫描一遍全部单词，每个收录的前缀只保留最先遇到的 TOP_K 个，
+           即该前缀下排名最高的单词，匹配集合大的前缀因此无需排序
+        """
+        deep: Set[str] = set()
+        keys = [fold_key(word) for (word,) in conn.execute("SELECT word FROM words")]
+        depth, parents = PREFIX_INDEX_DEPTH + 1, None
+        while keys:
+            keys = [key for key in keys if len(key) >= depth
+                    and (parents is None or key[:depth - 1] in parents)]
+            counts = Counter(key[:depth] for key in keys)
+            parents = {prefix for prefix, n in counts.items() if n > PREFIX_SCAN_LIMIT}
+            if not parents:
+                break
+            deep |= parents
+            depth += 1
+
+        top: Dict[str, List[str]] = {}
+        rows = conn.execute(f"SELECT word FROM words ORDER BY {RANK_SQL}, word")
+        for (word,) in rows:
+            key = fold_key(word)
+            for length in range(1, len(key) + 1):
+                prefix = key[:length]
+                if length > PREFIX_INDEX_DEPTH and prefix not in deep:
+                    break
+                bucket = top.setdefault(prefix, [])
+                if len(bucket) < PREFIX_INDEX_TOP_K:
+                    bucket.append(word)
+
+        conn.execute("DROP TABLE IF EXISTS prefix_index")
+        conn.execute('''
+            CREATE TABLE prefix_index (
+                prefix TEXT PRIMARY KEY,
+                words TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        conn.executemany(
+            "INSERT INTO prefix_index (prefix, words) VALUES (?, ?)",
+            ((prefix, '\n'.join(words)) for prefix, words in top.items()),
+        )
+        conn.execute(f"PRAGMA user_version = {DICT_SCHEMA_VERSION}")
+        conn.commit()
+
+    @classmethod
+    def _ensure_lemma_index(cls, conn: sqlite3.Connection) -> None:
+        """旧版数据库没有词形还原索引时补建"""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lemmas'"
+        ).fetchone()
+        if row is None:
+            print("正在为词典创建词形还原索引（仅首次执行）...")
+            cls._build_lemma_index(conn)
+
+    @staticmethod
+    def _build_lemma_index(conn: sqlite3.Connection) -> None:
+        """
+        根据 exchange 列构建 变形 -> 原形 的反向索引 lemmas
+
+        ECDICT 的 exchange 格式如 "p:learned/d:learned/i:learning/3:learns"，
+        变形词条自身则记录 "0:learn/1:p"。按词频排名顺序写入，
+        同一变形对应多个原形时保留最常用的那个。
+        """
+        conn.execute("DROP TABLE IF EXISTS lemmas")
+        conn.execute('''
+            CREATE TABLE lemmas (
+                form TEXT PRIMARY KEY,
+                lemma TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+
+        rows = conn.execute(
+            f"SELECT word, exchange FROM words WHERE exchange != '' ORDER BY {RANK_SQL}, word"
+        )
+        pairs = []
+        for word, exchange in rows:
+            for item in (exchange or '').split('/'):
+                kind, _, value = item.partition(':')
+                if not value:
+                    continue
+                if kind == '0':
+                    # 本词条是 value 的变形
+                    form, lemma = word, value
+                elif kind in EXCHANGE_FORM_TYPES:
+                    form, lemma = value, word
+                else:
+                    continue
+                form_key = fold_key(form)
+                if form_key and form_key != fold_key(lemma):
+                    pairs.append((form_key, lemma.strip()))
+            if len(pairs) >= 10000:
+                conn.executemany("INSERT OR IGNORE INTO lemmas (form, lemma) VALUES (?, ?)", pairs)
+                pairs = []
+        conn.executemany("INSERT OR IGNORE INTO lemmas (form, lemma) VALUES (?, ?)", pairs)
+        conn.commit()
+
+    @classmethod
+    def _ensure_spell_index(cls, conn: sqlite3.Connection) -> None:
+        """旧版数据库没有拼写纠错索引时补建"""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'spell_deletes'"
+        ).fetchone()
+        if row is None:
+            print("正在为词典创建拼写纠错索引（仅首次执行）...")
+            cls._build_spell_index(conn)
+
+    @staticmethod
+    def _build_spell_index(conn: sqlite3.Connection) -> None:
+        """
+        构建拼写纠错的删除索引
+
+        - spell_words：有词频排名的纯字母单词，id 即排名顺序（越小越常用）
+        - spell_deletes：单词前缀删除若干字母后的变体 -> 空格分隔的 spell_words.id
+
+        查询时对输入做同样的删除，命中同一变体的单词即为候选，
+        再用完整单词的编辑距离过滤。只收录有排名的单词，索引规模约为
+        常用词数 × 8（7 字母前缀删除 0~1 个字母的组合数）。
+        """
+        conn.execute("DROP TABLE IF EXISTS spell_words")
+        conn.execute("DROP TABLE IF EXISTS spell_deletes")
+        conn.execute('''
+            CREATE TABLE spell_words (
+                id INTEGER PRIMARY KEY,
+                word TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE spell_deletes (
+                key TEXT PRIMARY KEY,
+                ids TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+
+        rows = conn.execute(
+            f"SELECT word FROM words WHERE {RANK_SQL} < 1000000000 ORDER BY {RANK_SQL}, word"
+        )
+        seen = set()
+        spell_words = []
+        buckets: Dict[str, List[str]] = {}
+        for (word,) in rows:
+            key = fold_key(word)
+            if key in seen or not _SPELL_WORD.match(key):
+                continue
+            seen.add(key)
+            word_id = len(spell_words)
+            spell_words.append((word_id, word.strip()))
+            for deleted in spell_deletes(key[:SPELL_PREFIX_LENGTH]):
+                bucket = buckets.setdefault(deleted, [])
+                if len(bucket) < SPELL_BUCKET_SIZE:
+                    bucket.append(str(word_id))
+
+        conn.executemany("INSERT INTO spell_words (id, word) VALUES (?, ?)", spell_words)
+        conn.executemany(
+            "INSERT INTO spell_deletes (key, ids) VALUES (?, ?)",
+            ((key, ' '.join(ids)) for key, ids in buckets.items()),
+        )
+        conn.commit()
+
+    @staticmethod
+    def _fts_outdated(sql: Optional[str]) -> bool:
+        """旧版 words_fts 还索引了 definition 列（从未被查询），需要重建"""
+        return sql is not None and 'definition' in sql
+
+    @classmethod
+    def _ensure_fts(cls, conn: sqlite3.Connection) -> None:
+        """没有全文索引或全文索引是旧格式时补建；SQLite 未启用 FTS5 时跳过"""
+        rows = dict(conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE name IN ('words_fts', 'fts_rank')"
+        ).fetchall())
+        if len(rows) == 2 and not cls._fts_outdated(rows['words_fts']):
+            return
+        print("正在为词典创建中文反向查询全文索引（仅首次执行）...")
+        try:
+            cls._build_fts(conn)
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            print(f"⚠ 全文索引构建失败（SQLite 可能未启用 FTS5）: {e}")
+
+    @staticmethod
+    def _build_fts(conn: sqlite3.Connection) -> None:
+        """
+        构建中文反向查询的 FTS5 全文索引
+
+        - words_fts：无内容（contentless）FTS5 表，只索引 translation（search_by_chinese 只查这一列）。
+          translation 按单字切分，短语查询 "中 文" 即等价于子串匹配，1~2 个字的查询也能走索引
+        - fts_rank：FTS 行号到单词的映射。行号按词频排名分配，
+          FTS5 按行号顺序产出结果，取前 N 个时无需排序
+        """
+        conn.execute("DROP TABLE IF EXISTS words_fts")
+        conn.execute("DROP TABLE IF EXISTS fts_rank")
+        conn.execute('''
+            CREATE VIRTUAL TABLE words_fts USING fts5(
+                translation, content='', tokenize='unicode61'
+            )
+        ''')
+        conn.execute("CREATE TABLE fts_rank (id INTEGER PRIMARY KEY, word TEXT NOT NULL)")
+
+        rows = conn.execute(
+            f"SELECT word, translation FROM words ORDER BY {RANK_SQL}, word"
+        )
+        batch_rank, batch_fts = [], []
+        for rank_id, (word, translation) in enumerate(rows, 1):
+            batch_rank.append((rank_id, word))
+            batch_fts.append((rank_id, cjk_spaced(translation)))
+            if len(batch_rank) >= 10000:
+                conn.executemany("INSERT INTO fts_rank (id, word) VALUES (?, ?)", batch_rank)
+                conn.executemany("INSERT INTO words_fts (rowid, translation) VALUES (?, ?)", batch_fts)
+                batch_rank, batch_fts = [], []
+        conn.executemany("INSERT INTO fts_rank (id, word) VALUES (?, ?)", batch_rank)
+        conn.executemany("INSERT INTO words_fts (rowid, translation) VALUES (?, ?)", batch_fts)
+        conn.execute("INSERT INTO words_fts (words_fts) VALUES ('optimize')")
+        conn.commit()
+
+    def build_fts(self) -> None:
+        """为已有的 ecdict.db 构建中文反向查询全文索引（需要 SQLite 支持 FTS5）"""
+        print("正在构建中文反向查询全文索引...")
+        conn = sqlite3.connect(str(self.db_file))
+        try:
+            self._build_fts(conn)
+        finally:
+            conn.close()
+        # 只读连接按不可变文件打开，重建后需要重新连接才能看到新表
+        self.close()
+        print("✓ 全文索引构建完成")
+
+    def build_db(self, batch_size: int = 5000, with_fts: bool = True,
+                 checkpoint_rows: int = 100000, resume: bool = True) -> Dict[str, Any]:
         """
         构建 SQLite 数据库
 
+        先导入到同目录的临时文件 <db_file>.building，完成后原子替换 db_file，
+        构建过程中已有的词典仍可正常查询。
+
+        - 导入阶段关闭日志和同步（journal_mode=OFF / synchronous=OFF）并加大页缓存
+        - 所有索引在导入完成后一次性创建，避免边插入边维护 B 树
+        - 每导入 checkpoint_rows 行提交一次并记录进度；中断后再次调用会从
+          上次提交的位置继续（临时文件未通过完整性检查时从头开始）
+
         Args:
-            batch_size: 批量插入的行数，默认 5000
+            batch_size: 每次 executemany 的行数，默认 5000
+            with_fts: 是否同时构建中文反向查询的 FTS5 全文索引，默认构建；
+                不构建时 migrate() 会在启动时补建
+            checkpoint_rows: 每隔多少行提交一次并记录断点
+            resume: 是否尝试从上次中断的位置继续
+
+        Returns:
+            构建统计：rows（导入行数）、seconds（总耗时）、rows_per_sec（导入速度）
         """
         if not self.csv_file.exists():
             raise FileNotFoundError(f"找不到 CSV 文件: {self.csv_file}")
 
         print(f"正在构建数据库: {self.db_file}")
-        print("这可能需要几分钟，请稍候...")
+        start_time = time.time()
+        tmp_file = self.db_file.with_name(self.db_file.name + '.building')
 
-        # 1. 创建数据库连接
-        conn = sqlite3.connect(str(self.db_file))
+        # 1. 打开临时数据库，检查是否可以续建
+        done = 0
+        if tmp_file.exists() and resume:
+            done = self._read_build_checkpoint(tmp_file)
+        elif tmp_file.exists():
+            tmp_file.unlink()
+        if done:
+            print(f"检测到未完成的构建，从第 {done} 条继续...")
+
+        conn = sqlite3.connect(str(tmp_file))
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-262144")  # 256 MB
         cursor = conn.cursor()
 
-        # 2. 创建表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS words (
-                word TEXT PRIMARY KEY,
-                phonetic TEXT,
-                definition TEXT,
-                translation TEXT,
-                pos TEXT,
-                collins INTEGER,
-                oxford INTEGER,
-                tag TEXT,
-                bnc INTEGER,
-                frq INTEGER,
-                exchange TEXT,
-                detail TEXT,
-                audio TEXT
-            )
-        ''')
+        try:
+            # 2. 创建表（不建任何二级索引）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS words (
+                    word TEXT PRIMARY KEY,
+                    phonetic TEXT,
+                    definition TEXT,
+                    translation TEXT,
+                    pos TEXT,
+                    collins INTEGER,
+                    oxford INTEGER,
+                    tag TEXT,
+                    bnc INTEGER,
+                    frq INTEGER,
+                    exchange TEXT,
+                    detail TEXT,
+                    audio TEXT
+                )
+            ''')
+            cursor.execute("CREATE TABLE IF NOT EXISTS build_state (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.commit()
 
-        # 3. 创建索引（加快查询速度）
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_word ON words(word)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trans ON words(translation)')
+            # 3. 读取 CSV 并导入
+            # 注意：ecdict.csv 第一行是标题，需要跳过
+            # 字段映射：word, phonetic, definition, translation, pos, collins, oxford, tag, bnc, frq, exchange, detail, audio
+            print("开始导入数据...")
+            insert_sql = '''
+                INSERT OR REPLACE INTO words 
+                (word, phonetic, definition, translation, pos, collins, oxford, 
+                 tag, bnc, frq, exchange, detail, audio)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            '''
+            load_start = time.time()
+            count = 0
+            consumed = done
 
-        # 4. 读取 CSV 并导入
-        # 注意：ecdict.csv 第一行是标题，需要跳过
-        # 字段映射：word, phonetic, definition, translation, pos, collins, oxford, tag, bnc, frq, exchange, detail, audio
+            with open(self.csv_file, 'r', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                next(reader)  # 跳过标题行
+                # 跳过已提交的记录（按 CSV 记录数计，与是否导入无关）
+                for _ in itertools.islice(reader, done):
+                    pass
 
-        print("开始导入数据...")
+                batch = []
+                since_checkpoint = 0
+                for row in reader:
+                    consumed += 1
+                    # 确保数据完整（至少前4列）
+                    if len(row) >= 4:
+                        # 补全数据到13列，防止报错
+                        batch.append(row[:13] + [''] * (13 - len(row)) if len(row) < 13 else row[:13])
+                        count += 1
 
-        with open(self.csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # 跳过标题行
+                    if len(batch) >= batch_size:
+                        cursor.executemany(insert_sql, batch)
+                        since_checkpoint += len(batch)
+                        batch = []
 
-            batch = []
-            count = 0
+                    # 断点：提交并记录已消费的 CSV 记录数
+                    if since_checkpoint >= checkpoint_rows:
+                        self._write_build_checkpoint(conn, consumed)
+                        since_checkpoint = 0
+                        elapsed = time.time() - load_start
+                        print(f"已导入 {consumed} 条（{count / max(elapsed, 1e-9):,.0f} 行/秒）...", end='\r')
 
-            for row in reader:
-                # 确保数据完整（至少前4列）
-                if len(row) < 4:
-                    continue
+                if batch:
+                    cursor.executemany(insert_sql, batch)
+                self._write_build_checkpoint(conn, consumed)
 
-                # 补全数据到13列，防止报错
-                data = row[:13] + [''] * (13 - len(row)) if len(row) < 13 else row[:13]
+            load_seconds = time.time() - load_start
+            print(f"\n✓ 导入完成：{count} 条，{load_seconds:.1f} 秒，"
+                  f"{count / max(load_seconds, 1e-9):,.0f} 行/秒")
 
-                batch.append(data)
-                count += 1
+            # 4. 导入完成后统一建索引
+            #    words.word 的主键自带唯一索引；idx_word_nocase 供大小写无关查询使用
+            print("正在创建索引...")
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_word_nocase ON words(word COLLATE NOCASE)')
+            conn.commit()
+
+            # 5. 构建前缀索引（fuzzy_search 使用）、词形还原索引（lemmatize 使用）
+            #    和拼写纠错索引（suggest 使用）
+            self._build_prefix_index(conn)
+            self._build_lemma_index(conn)
+            self._build_spell_index(conn)
+
+            # 6. 中文反向查询全文索引（search_by_chinese 使用）
+            if with_fts:
+                try:
+                    self._build_fts(conn)
+                except sqlite3.OperationalError as e:
+                    print(f"⚠ 全文索引构建失败（SQLite 可能未启用 FTS5）: {e}")
+
+            # 7. 记录构建版本，磁盘翻译缓存据此判断词典是否被重新构建
+            cursor.execute("CREATE TABLE IF NOT EXISTS dict_meta (key TEXT PRIMARY KEY, value TEXT)")
+            cursor.execute(
+                "INSERT OR REPLACE INTO dict_meta (key, value) VALUES ('version', ?)",
+                (str(time.time_ns()),),
+            )
+
+            # 8. 清理断点信息，切换为普通日志模式后原子替换正式文件
+            cursor.execute("DROP TABLE build_state")
+            conn.commit()
+            conn.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            # 中途失败时也要释放独占锁，临时文件留待下次续建
+            conn.close()
+        os.replace(tmp_file, self.db_file)
+        # 已打开的只读连接仍指向旧文件，关闭后下次查询重新连接
+        self.close()
 
-                # 批量提交
-                if len(batch) >= batch_size:
-                    cursor.executemany('''
-                        INSERT OR REPLACE INTO words 
-                        (word, phonetic, definition, translation, pos, collins, oxford, 
-                         tag, bnc, frq, exchange, detail, audio)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', batch)
-                    conn.commit()
-                    print(f"已导入 {count} 条...", end='\r')
-                    batch = []
-
-            # 提交剩余数据
-            if batch:
-                cursor.executemany('''
-                    INSERT OR REPLACE INTO words 
-                    (word, phonetic, definition, translation, pos, collins, oxford, 
-                     tag, bnc, frq, exchange, detail, audio)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', batch)
-                conn.commit()
-
-        conn.close()
-        print(f"\n✓ 构建完成！共导入 {count} 个单词。")
+        seconds = time.time() - start_time
+        print(f"✓ 构建完成！本次导入 {count} 个单词，总耗时 {seconds:.1f} 秒。")
         print(f"✓ 数据库大小: {self.db_file.stat().st_size / 1024 / 1024:.2f} MB")
+        return {
+            'rows': count,
+            'seconds': round(seconds, 2),
+            'rows_per_sec': round(count / max(load_seconds, 1e-9)),
+        }
+
+    @staticmethod
+    def _write_build_checkpoint(conn: sqlite3.Connection, consumed: int) -> None:
+        """在同一事务中记录已导入的 CSV 记录数并提交"""
+        conn.execute(
+            "INSERT OR REPLACE INTO build_state (key, value) VALUES ('consumed', ?)", (consumed,)
+        )
+        conn.commit()
+
+    @staticmethod
+    def _read_build_checkpoint(tmp_file: Path) -> int:
+        """
+        读取未完成构建的断点
+
+        导入阶段关闭了日志，进程在写入中途被杀可能留下损坏的文件，
+        完整性检查不通过时删除临时文件从头构建。
+        """
+        try:
+            conn = sqlite3.connect(str(tmp_file))
+            try:
+                if conn.execute("PRAGMA quick_check").fetchone()[0] != 'ok':
+                    raise sqlite3.DatabaseError("quick_check failed")
+                row = conn.execute(
+                    "SELECT value FROM build_state WHERE key = 'consumed'"
+                ).fetchone()
+                return row[0] if row else 0
+            finally:
+                conn.close()
+        except sqlite3.DatabaseError as e:
+            print(f"未完成的构建文件不可用（{e}），重新开始构建")
+            tmp_file.unlink()
+            return 0
 
     def is_built(self) -> bool:
         """检查数据库是否已构建"""
         return self.db_file.exists() and self.db_file.stat().st_size > 0
 
+    # 精确查询：通过 idx_word_nocase 索引查询；大小写不同的同形词优先返回完全匹配的一条，
+    # 其次是全小写的一条，再按字节序取第一条，与编译词典的条目顺序一致
+    SEARCH_SQL = '''
+        SELECT * FROM words
+        WHERE word = ? COLLATE NOCASE
+        ORDER BY word = ? DESC, word != lower(word), word
+        LIMIT 1
+    '''
+
     def search(self, word: str) -> Optional[Dict[str, Any]]:
         """
         精确查询单词
@@ -170,20 +876,222 @@ class ECDict:
         Returns:
             包含单词信息的字典，未找到返回 None
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        word = word.strip()
+        compiled = self._get_compiled()
+        if compiled is not None:
+            return compiled.get(word)
 
-        cursor.execute('''
-            SELECT * FROM words 
-            WHERE lower(word) = lower(?)
-        ''', (word.strip(),))
-
-        row = cursor.fetchone()
+        # 单词查询是最热的路径，直接借还连接，省去上下文管理器的开销
+        conn = self._acquire()
+        try:
+            row = conn.execute(self.SEARCH_SQL, (word, word)).fetchone()
+        finally:
+            self._release(conn)
         return dict(row) if row else None
 
+    def search_many(self, words: List[str], chunk_size: int = 500,
+                    columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        批量精确查询单词
+
+        把整个单词列表按 chunk_size 分块，每块一条 IN (...) 查询，
+        同样走 idx_word_nocase 索引，避免逐词往返数据库。
+
+        Args:
+            words: 单词列表
+            chunk_size: 每条 SQL 的参数个数上限
+            columns: 只读取这些列（须包含 word），默认全部；
+                预加载只需要音标和释义，不必读取 detail、exchange 等大字段。
+                使用编译词典时总是返回完整记录
+
+        Returns:
+            查询词到单词信息字典的映射，未找到的单词不出现在结果中
+        """
+        compiled = self._get_compiled()
+        if compiled is not None:
+            results = {}
+            for word in words:
+                if word and word.strip():
+                    record = compiled.get(word)
+                    if record is not None:
+                        results[word] = record
+            return results
+
+        # 小写键 -> 同一小写形式的候选行
+        keys = list({w.strip().lower() for w in words if w and w.strip()})
+        rows_by_key: Dict[str, List[Dict[str, Any]]] = {}
+        selected = ', '.join(columns) if columns else '*'
+
+        with self._connection() as conn:
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f'''
+                    SELECT {selected} FROM words
+                    WHERE word COLLATE NOCASE IN ({placeholders})
+                ''', chunk).fetchall()
+                for row in rows:
+                    row = dict(row)
+                    key = row['word'].lower()
+                    candidates = rows_by_key.get(key)
+                    if candidates is None:
+                        rows_by_key[key] = [row]
+                    else:
+                        candidates.append(row)
+
+        results = {}
+        for word in words:
+            if not word:
+                continue
+            stripped = word.strip()
+            candidates = rows_by_key.get(stripped.lower())
+            if not candidates:
+                continue
+            if len(candidates) == 1:
+                results[word] = candidates[0]
+                continue
+            # 与 search 的排序一致：完全匹配 > 全小写 > 字节序最小
+            results[word] = min(candidates, key=lambda row: (
+                row['word'] != stripped, row['word'] != row['word'].lower(), row['word']
+            ))
+        return results
+
+    def lemmatize(self, word: str) -> Optional[str]:
+        """
+        查询变形词的原形
+
+        Args:
+            word: 变形词，如 representations / learned
+
+        Returns:
+            原形，没有记录时返回 None
+        """
+        return self.lemmatize_many([word]).get(word)
+
+    def lemmatize_many(self, words: List[str], chunk_size: int = 500) -> Dict[str, str]:
+        """
+        批量查询变形词的原形
+
+        Returns:
+            查询词到原形的映射，没有记录的单词不出现在结果中
+        """
+        keys = list({fold_key(w) for w in words if w and w.strip()})
+        lemma_by_key: Dict[str, str] = {}
+        with self._connection() as conn:
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT form, lemma FROM lemmas WHERE form IN ({placeholders})", chunk
+                ).fetchall()
+                lemma_by_key.update((row['form'], row['lemma']) for row in rows)
+
+        return {
+            word: lemma_by_key[fold_key(word)]
+            for word in words
+            if word and fold_key(word) in lemma_by_key
+        }
+
+    def suggest(self, word: str) -> Optional[str]:
+        """
+        拼写纠错：返回与 word 编辑距离最小、且最常用的词典单词
+
+        用于 PDF 提取出错（连字丢失、拼写错误）导致的查询未命中。
+        纠正结果可能是另一个单词，展示时应注明"已纠正为 X"。
+
+        Args:
+            word: 未命中的单词（保留原文大小写，缩写不纠错）
+
+        Returns:
+            纠正后的单词，没有足够接近的候选时返回 None
+        """
+        return self.suggest_many([word]).get(word)
+
+    def suggest_many(self, words: List[str], chunk_size: int = 500) -> Dict[str, str]:
+        """
+        批量拼写纠错
+
+        只纠正不短于 SPELL_MIN_LENGTH 的单词，且只接受 SPELL_MAX_DISTANCE 次编辑；
+        词首以外含大写字母的单词（BERT、ResNet 等缩写和专名）不纠错，
+        避免把术语改成毫不相干的常用词。
+
+        Returns:
+            查询词到纠正结果的映射，没有候选的单词不出现在结果中
+        """
+        # 查询词 -> 查询键
+        key_of: Dict[str, str] = {}
+        for word in words:
+            stripped = word.strip() if word else ''
+            key = fold_key(stripped)
+            if len(key) >= SPELL_MIN_LENGTH and _SPELL_WORD.match(key) and stripped[1:] == key[1:]:
+                key_of[word] = key
+        if not key_of:
+            return {}
+
+        # 每个查询键的删除变体 -> 命中的候选 id
+        deletes_of = {key: spell_deletes(key[:SPELL_PREFIX_LENGTH]) for key in set(key_of.values())}
+        all_deletes = list(set().union(*deletes_of.values()))
+        ids_by_delete: Dict[str, List[int]] = {}
+        word_by_id: Dict[int, str] = {}
+        with self._connection() as conn:
+            for i in range(0, len(all_deletes), chunk_size):
+                chunk = all_deletes[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, ids FROM spell_deletes WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                ids_by_delete.update((row['key'], [int(x) for x in row['ids'].split()])
+                                     for row in rows)
+            all_ids = list({i for ids in ids_by_delete.values() for i in ids})
+            for i in range(0, len(all_ids), chunk_size):
+                chunk = all_ids[i:i + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(
+                    f"SELECT id, word FROM spell_words WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+                word_by_id.update((row['id'], row['word']) for row in rows)
+
+        best_by_key: Dict[str, str] = {}
+        for key, deletes in deletes_of.items():
+            candidate_ids = {i for d in deletes for i in ids_by_delete.get(d, ())}
+            # id 即词频排名，第一个编辑距离为 1 的候选即最优
+            for word_id in sorted(candidate_ids):
+                candidate = word_by_id.get(word_id)
+                if candidate is None:
+                    continue
+                if edit_distance(key, fold_key(candidate), SPELL_MAX_DISTANCE) == 1:
+                    best_by_key[key] = candidate
+                    break
+
+        return {word: best_by_key[key] for word, key in key_of.items() if key in best_by_key}
+
+    def top_words(self, limit: int) -> List[str]:
+        """
+        按词频排名返回最常用的 limit 个单词（用于启动时预热翻译缓存）
+
+        只包含有 frq/bnc 排名的单词，按 fold_key 去重。
+        """
+        if limit <= 0:
+            return []
+        words: List[str] = []
+        seen = set()
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT word FROM words WHERE {RANK_SQL} < 1000000000 ORDER BY {RANK_SQL}, word"
+            )
+            for (word,) in rows:
+                key = fold_key(word)
+                if key in seen:
+                    continue
+                seen.add(key)
+                words.append(key)
+                if len(words) >= limit:
+                    break
+        return words
+
     def fuzzy_search(self, keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        模糊搜索单词（前缀匹配）
+        模糊搜索单词（前缀匹配），按词频排名返回
 
         Args:
             keyword: 关键词
@@ -192,22 +1100,47 @@ class ECDict:
         Returns:
             单词列表
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        key = fold_key(keyword)
+        if not key or limit <= 0:
+            return []
+
+        with self._connection() as conn:
+            # 短前缀和匹配较多的长前缀：直接读取预存的前 K 个单词
+            row = None
+            if limit <= PREFIX_INDEX_TOP_K:
+                row = conn.execute(
+                    "SELECT words FROM prefix_index WHERE prefix = ?", (key,)
+                ).fetchone()
+                if row is None and len(key) <= PREFIX_INDEX_DEPTH:
+                    return []
+            if row is not None:
+                words = row[0].split('\n')[:limit]
+                placeholders = ','.join('?' * len(words))
+                rows = conn.execute(f'''
+                    SELECT word, phonetic, translation, pos
+                    FROM words
+                    WHERE word IN ({placeholders})
+                ''', words).fetchall()
+                by_word = {row['word']: dict(row) for row in rows}
+                return [by_word[w] for w in words if w in by_word]
 
-        cursor.execute('''
-            SELECT word, phonetic, translation, pos 
-            FROM words 
-            WHERE word LIKE ?
-            ORDER BY bnc DESC
-            LIMIT ?
-        ''', (f"{keyword.lower()}%", limit))
+            # 未收录的长前缀匹配不超过 PREFIX_SCAN_LIMIT 个单词，在 NOCASE 索引上范围扫描后排序
+            rows = conn.execute(f'''
+                SELECT word, phonetic, translation, pos 
+                FROM words 
+                WHERE word >= ? COLLATE NOCASE AND word < ? COLLATE NOCASE
+                ORDER BY {RANK_SQL}, word
+                LIMIT ?
+            ''', (key, key + '\U0010ffff', limit)).fetchall()
 
-        return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     def search_by_chinese(self, chinese: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
-        中文反向查询
+        中文反向查询，按词频排名返回
+
+        有全文索引（build_db 默认构建，migrate 为旧版词典补建）时走索引，
+        SQLite 未启用 FTS5 时退回全表扫描。
 
         Args:
             chinese: 中文释义
@@ -216,18 +1149,43 @@ class ECDict:
         Returns:
             单词列表
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        chinese = chinese.strip()
+        if not chinese or limit <= 0:
+            return []
 
-        cursor.execute('''
-            SELECT word, phonetic, translation, pos 
-            FROM words 
-            WHERE translation LIKE ?
-            ORDER BY bnc DESC
-            LIMIT ?
-        ''', (f"%{chinese}%", limit))
+        with self._connection() as conn:
+            has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'words_fts'"
+            ).fetchone() is not None
+            tokens = cjk_spaced(chinese).replace('"', ' ').split()
 
-        return [dict(row) for row in cursor.fetchall()]
+            if has_fts and tokens:
+                # 短语查询：相邻单字依次出现，即 translation 中包含该子串；
+                # 末尾词元按前缀匹配，兼容 "词1" 匹配 "词10" 这类中英混合输入
+                phrase = '"' + ' '.join(tokens) + '" *'
+                rows = conn.execute('''
+                    SELECT w.word, w.phonetic, w.translation, w.pos
+                    FROM (
+                        SELECT rowid AS id FROM words_fts
+                        WHERE words_fts MATCH ?
+                        ORDER BY rowid
+                        LIMIT ?
+                    ) AS m
+                    JOIN fts_rank AS r ON r.id = m.id
+                    JOIN words AS w ON w.word = r.word
+                    ORDER BY m.id
+                ''', (f"translation : {phrase}", limit)).fetchall()
+            else:
+                # 未构建全文索引时退回全表扫描
+                rows = conn.execute(f'''
+                    SELECT word, phonetic, translation, pos 
+                    FROM words 
+                    WHERE translation LIKE ?
+                    ORDER BY {RANK_SQL}, word
+                    LIMIT ?
+                ''', (f"%{chinese}%", limit)).fetchall()
+
+        return [dict(row) for row in rows]
 
     def run(self, user_input: str):
         if not user_input:
@@ -260,7 +1218,14 @@ class ECDict:
                     output = f"音标：/{phonetic or ''}/。释义：{translation}"
                     return output
                 else:
-                    # 如果精确匹配不到，尝试模糊搜索
+                    # 精确匹配不到时先尝试拼写纠错
+                    suggestion = self.suggest(user_input)
+                    result = self.search(suggestion) if suggestion else None
+                    if result:
+                        return (f"已纠正为 {result['word']}。音标：/{result.get('phonetic', '') or ''}/。"
+                                f"释义：{result.get('translation', '')}")
+
+                    # 仍然找不到，尝试模糊搜索
                     print("未找到精确匹配，尝试模糊搜索...")
                     results = self.fuzzy_search(user_input)
                     if results:
@@ -276,9 +1241,22 @@ class ECDict:
             return error_msg
 
     def close(self):
-        """关闭数据库连接"""
-        # 不再需要关闭连接，因为每次查询都会创建新连接
-        pass
+        """
+        关闭连接池中的所有空闲连接
+
+        词典文件被重建后也应调用本方法，只读连接按不可变文件打开，不会感知文件变化。
+        """
+        with self._pool_lock:
+            while True:
+                try:
+                    conn = self._idle.pop()
+                except IndexError:
+                    break
+                conn.close()
+            if self._compiled is not None:
+                self._compiled.close()
+            self._compiled = None
+            self._compiled_checked = False
 
 
 # ==========================================
@@ -343,7 +1321,15 @@ if __name__ == "__main__":
                     if result['collins']:
                         print(f"  星级: 柯林斯 {result['collins']} 星")
                 else:
-                    # 如果精确匹配不到，尝试模糊搜索
+                    # 精确匹配不到时先尝试拼写纠错
+                    suggestion = tool.suggest(user_input)
+                    result = tool.search(suggestion) if suggestion else None
+                    if result:
+                        print(f"\n已纠正为【{result['word']}】{result['phonetic'] or ''}")
+                        print(f"  释义: {result['translation']}")
+                        continue
+
+                    # 仍然找不到，尝试模糊搜索
                     print("未找到精确匹配，尝试模糊搜索...")
                     results = tool.fuzzy_search(user_input)
                     if results:
@@ -0,0 +1,435 @@
+"""
+翻译缓存模块 - 有容量上限的 LRU 缓存 + 可选的磁盘持久层
+功能：
+1. 按条目数和近似内存占用双重限制缓存大小
+2. 超限时淘汰最久未使用的条目
+3. 统计命中、未命中、淘汰次数
+4. 按键哈希分片加锁，并发读写不同分片互不阻塞
+5. 将格式化后的翻译结果持久化到 SQLite，重启后无需重新查词典
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    有容量上限的 LRU 缓存
+
+    本类不加锁，并发访问时由调用方负责同步。
+    max_entries / max_bytes 为 0 表示不限制对应维度。
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0,
+                 sizeof: Optional[Callable[[Hashable, Any], int]] = None):
+        """
+        Args:
+            max_entries: 最大条目数
+            max_bytes: 最大近似内存占用（字节）
+            sizeof: 估算单个条目 (key, value) 占用字节数的函数
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof or (lambda key, value: sys.getsizeof(key) + sys.getsizeof(value))
+        # key -> (value, size)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """仅判断是否存在，不影响 LRU 顺序和命中统计"""
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取条目，命中时移到最近使用端"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """写入条目，必要时淘汰最久未使用的条目"""
+        self._store(key, value)
+        self._evict()
+
+    def update(self, items: Dict[Hashable, Any]) -> None:
+        """批量写入，全部写入后统一淘汰一次"""
+        for key, value in items.items():
+            self._store(key, value)
+        self._evict()
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(key, value)
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._data[key] = (value, size)
+        self._bytes += size
+
+    def keys(self, limit: Optional[int] = None) -> List[Hashable]:
+        """按从旧到新的顺序返回键"""
+        if limit is None:
+            return list(self._data.keys())
+        keys = []
+        for key in self._data:
+            if len(keys) >= limit:
+                break
+            keys.append(key)
+        return keys
+
+    def items(self) -> Iterable[Tuple[Hashable, Any]]:
+        """遍历 (key, value)，不影响 LRU 顺序"""
+        return ((key, entry[0]) for key, entry in self._data.items())
+
+    def clear(self) -> None:
+        """清空缓存（保留统计计数）"""
+        self._data.clear()
+        self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._data and (
+            (self.max_entries and len(self._data) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "cache_size": len(self._data),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "memory_bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class ShardedLRUCache:
+    """
+    按键哈希分片的线程安全 LRU 缓存
+
+    每个分片是一个独立的 LRUCache 和一把锁，落在不同分片的读写互不阻塞。
+    容量上限平均分给各分片，淘汰在分片内按 LRU 进行（近似全局 LRU）。
+    批量读写按分片分组，每个分片只加一次锁。
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0,
+                 sizeof: Optional[Callable[[Hashable, Any], int]] = None,
+                 shards: int = 16):
+        """
+        Args:
+            max_entries: 最大条目数（全部分片合计）
+            max_bytes: 最大近似内存占用（全部分片合计）
+            sizeof: 估算单个条目 (key, value) 占用字节数的函数
+            shards: 分片数，向上取整为 2 的幂；容量上限小于分片数时减少分片，
+                保证每个分片至少分到 1（分片上限为 0 会变成不限制）
+        """
+        count = 1
+        while count < shards:
+            count *= 2
+        for limit in (max_entries, max_bytes):
+            while limit and count > limit:
+                count //= 2
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._mask = count - 1
+        # 余数分给前几个分片，各分片上限之和恰好等于总上限
+        self._shards = [
+            LRUCache(
+                max_entries=max_entries // count + (i < max_entries % count),
+                max_bytes=max_bytes // count + (i < max_bytes % count),
+                sizeof=sizeof,
+            )
+            for i in range(count)
+        ]
+        self._locks = [threading.Lock() for _ in range(count)]
+
+    def _group(self, keys: Iterable[Hashable]) -> Dict[int, List[Hashable]]:
+        groups: Dict[int, List[Hashable]] = {}
+        mask = self._mask
+        for key in keys:
+            index = hash(key) & mask
+            group = groups.get(index)
+            if group is None:
+                groups[index] = [key]
+            else:
+                group.append(key)
+        return groups
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """仅判断是否存在，不影响 LRU 顺序和命中统计"""
+        index = hash(key) & self._mask
+        with self._locks[index]:
+            return key in self._shards[index]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """读取条目，命中时移到所在分片的最近使用端"""
+        index = hash(key) & self._mask
+        with self._locks[index]:
+            return self._shards[index].get(key, default)
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """批量读取，返回命中的条目"""
+        found = {}
+        for index, group in self._group(keys).items():
+            shard = self._shards[index]
+            with self._locks[index]:
+                for key in group:
+                    value = shard.get(key)
+                    if value is not None:
+                        found[key] = value
+        return found
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """写入条目"""
+        index = hash(key) & self._mask
+        with self._locks[index]:
+            self._shards[index].put(key, value)
+
+    def update(self, items: Dict[Hashable, Any]) -> None:
+        """批量写入"""
+        for index, group in self._group(items).items():
+            shard = self._shards[index]
+            with self._locks[index]:
+                shard.update({key: items[key] for key in group})
+
+    def keys(self, limit: Optional[int] = None) -> List[Hashable]:
+        """返回键（每个分片内从旧到新）"""
+        keys: List[Hashable] = []
+        for shard, lock in zip(self._shards, self._locks):
+            remaining = None if limit is None else limit - len(keys)
+            if remaining is not None and remaining <= 0:
+                break
+            with lock:
+                keys.extend(shard.keys(remaining))
+        return keys
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """全部 (key, value) 的快照，不影响 LRU 顺序"""
+        items: List[Tuple[Hashable, Any]] = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                items.extend(shard.items())
+        return items
+
+    def clear(self) -> None:
+        """清空缓存（保留统计计数）"""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存统计信息（各分片合计）"""
+        totals = {"cache_size": 0, "memory_bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard_stats = shard.stats()
+            for key in totals:
+                totals[key] += shard_stats[key]
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "cache_size": totals["cache_size"],
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "memory_bytes": totals["memory_bytes"],
+            "hits": totals["hits"],
+            "misses": totals["misses"],
+            "evictions": totals["evictions"],
+            "hit_ratio": round(totals["hits"] / lookups, 4) if lookups else 0.0,
+            "shards": len(self._shards),
+        }
+
+
+# 词典路径 -> ((文件大小, 修改时间), 内容签名)；文件没有变化时不重新打开词典
+_signature_memo: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def dictionary_signature(dict_path: str) -> str:
+    """
+    词典内容签名：构建版本（build_db 写入 dict_meta）+ 词条数 + 是否有词形还原索引
+
+    补建查询索引、切换日志模式等维护操作会改变文件修改时间，但不改变签名；
+    重新构建词典后构建版本变化。词形还原索引影响查不到的单词的结果，计入签名。
+    文件大小和修改时间不变时直接返回上次的结果，只需一次 stat。
+    """
+    try:
+        st = os.stat(dict_path)
+    except OSError:
+        return "missing"
+    stamp = (st.st_size, st.st_mtime_ns)
+    memo = _signature_memo.get(dict_path)
+    if memo is not None and memo[0] == stamp:
+        return memo[1]
+
+    try:
+        conn = sqlite3.connect(f"{Path(dict_path).resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            tables = {name for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('dict_meta', 'lemmas')"
+            )}
+            version = ""
+            if "dict_meta" in tables:
+                row = conn.execute("SELECT value FROM dict_meta WHERE key = 'version'").fetchone()
+                version = row[0] if row else ""
+            rows = conn.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # 无法读取内容时退回文件签名
+        return f"{st.st_size}:{st.st_mtime_ns}"
+    signature = f"{version}:{rows}:{int('lemmas' in tables)}"
+    _signature_memo[dict_path] = (stamp, signature)
+    return signature
+
+
+class PersistentTranslationCache:
+    """
+    磁盘翻译缓存（SQLite）
+
+    只保存格式化后的翻译结果 (word, translation, phonetic, meaning)。
+    打开时和每次读取前（check_signature）比较词典签名，
+    词典重新构建后自动清空，避免返回过期翻译。
+    """
+
+    def __init__(self, cache_path: str, dict_path: str):
+        """
+        Args:
+            cache_path: 缓存数据库路径
+            dict_path: 词典数据库路径，用于失效检测
+        """
+        self.cache_path = cache_path
+        self.dict_path = dict_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                word TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                phonetic TEXT,
+                meaning TEXT
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        self._conn.commit()
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'dict_signature'"
+        ).fetchone()
+        self._signature = row[0] if row else None
+        self.check_signature()
+
+    def check_signature(self) -> bool:
+        """
+        词典签名与缓存记录的不一致时清空缓存
+
+        签名按文件状态缓存，词典未变化时只需一次 stat，可以在每次读取前调用。
+
+        Returns:
+            是否因词典变化清空了缓存
+        """
+        signature = dictionary_signature(self.dict_path)
+        if signature == self._signature:
+            return False
+        with self._lock:
+            if signature == self._signature:
+                return False
+            changed = self._signature is not None
+            if changed:
+                print("词典已更新，清空磁盘翻译缓存")
+            self._conn.execute("DELETE FROM translations")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('dict_signature', ?)",
+                (signature,),
+            )
+            self._conn.commit()
+            self._signature = signature
+        return changed
+
+    def get_many(self, keys: List[str], chunk_size: int = 500) -> Dict[str, Tuple[str, str, str, str]]:
+        """
+        批量读取
+
+        Returns:
+            key -> (word, translation, phonetic, meaning)，未命中的键不出现在结果中
+        """
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, word, translation, phonetic, meaning FROM translations "
+                    f"WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, word, translation, phonetic, meaning in rows:
+                    found[key] = (word, translation, phonetic or "", meaning or "")
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items: Dict[str, Tuple[str, str, str, str]]) -> None:
+        """批量写入，一个事务提交"""
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, word, translation, phonetic, meaning) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key,) + tuple(value) for key, value in items.items()],
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """清空磁盘缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """磁盘缓存统计信息"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        return {
+            "path": self.cache_path,
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
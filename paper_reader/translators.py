@@ -1,26 +1,87 @@
 """翻译模块 - 处理单词翻译功能"""
 
 import os
+import sqlite3
 import sys
+import time
+from pathlib import Path
 import translate
+from config import DICT_DB_PATH
 from batch_translator import get_batch_translator
 
 # 全局批量翻译器实例
 batch_translator = None
 
+# 词典检查结果，由 init_dictionary 填写
+_dictionary_status = None
+
+
+def check_dictionary(db_path=DICT_DB_PATH):
+    """
+    检查词典数据库是否可用
+
+    Returns:
+        (是否可用, 错误信息)
+    """
+    if not os.path.isfile(db_path):
+        return False, f"词典数据库不存在: {db_path}（请先用 translate.py 从 ecdict.csv 构建）"
+    try:
+        conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT word FROM words LIMIT 1").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return False, f"词典数据库不可用: {db_path}（{e}）"
+    if row is None:
+        return False, f"词典数据库为空: {db_path}"
+    return True, None
+
+
+def init_dictionary(db_path=DICT_DB_PATH):
+    """
+    启动阶段：定位、打开并校验词典，创建全局批量翻译器
+
+    补建缺失的索引、打开第一个只读连接都在这里完成，第一个翻译请求不再承担这些开销。
+
+    Returns:
+        词典是否可用
+    """
+    global batch_translator, _dictionary_status
+    start_time = time.time()
+    ok, error = check_dictionary(db_path)
+    if ok:
+        try:
+            batch_translator = get_batch_translator(db_path)
+            batch_translator.open_dictionary()
+        except Exception as e:
+            ok, error = False, f"打开词典失败: {db_path}（{e}）"
+
+    _dictionary_status = {
+        "ready": ok,
+        "path": db_path,
+        "error": error,
+        "seconds": round(time.time() - start_time, 3),
+    }
+    if ok:
+        print(f"✓ 词典已就绪: {db_path}（{_dictionary_status['seconds']:.2f} 秒）")
+    else:
+        print(f"✗ {error}")
+    return ok
+
+
+def get_dictionary_status():
+    """词典就绪状态（未执行过启动检查时先检查一次）"""
+    if _dictionary_status is None:
+        init_dictionary()
+    return dict(_dictionary_status)
+
 
 def get_global_batch_translator():
-    """获取全局批量翻译器实例"""
+    """获取全局批量翻译器实例（词典路径固定为 config.DICT_DB_PATH）"""
     global batch_translator
     if batch_translator is None:
-        # 查找词典数据库路径
-        db_path = "ecdict.db"
-        # 尝试在项目目录中查找
-        for root, dirs, files in os.walk("."):
-            if "ecdict.db" in files:
-                db_path = os.path.join(root, "ecdict.db")
-                break
-        batch_translator = get_batch_translator(db_path)
+        batch_translator = get_batch_translator(DICT_DB_PATH)
     return batch_translator
 
 
@@ -39,7 +100,7 @@ def call_translator(word, context=""):
     except Exception as e:
         # 备用：使用原始翻译方式
         try:
-            translate_tool = translate.ECDict()
+            translate_tool = translate.ECDict(db_file=DICT_DB_PATH)
             result = translate_tool.run(word)
             if isinstance(result, str) and result.startswith("[翻译错误]"):
                 return result